@@ -0,0 +1,55 @@
+"""
+Keyword-based chat category matching shared by the simple API servers
+"""
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
+
+# Chat keywords per category, in match-priority order
+CHAT_KEYWORDS = (
+    ("greeting", ("hi", "hello", "hey", "greetings", "good morning", "good afternoon", "good evening")),
+    ("account", ("password", "reset", "forgot", "login", "access", "account")),
+    ("vpn", ("vpn", "remote", "connect", "network", "virtual private network")),
+    ("performance", ("slow", "performance", "lag", "freeze", "hanging", "optimize")),
+    ("software", ("software", "install", "application", "program", "app")),
+    ("support_hours", ("hours", "time", "available", "support", "contact")),
+    ("security", ("cybersecurity", "security", "hack", "malware", "virus", "phishing")),
+    ("programming", ("programming", "code", "development", "python", "javascript", "java", "coding")),
+    ("science", ("science", "physics", "chemistry", "biology", "mathematics", "math")),
+    ("business", ("business", "finance", "economics", "marketing", "management")),
+    ("health", ("health", "medical", "wellness", "fitness", "nutrition")),
+    ("travel", ("travel", "trip", "vacation", "destination", "tourism")),
+    ("information", ("information", "info", "data", "knowledge", "facts", "details")),
+    ("explain", ("what", "how", "why", "when", "where", "who", "explain", "define", "meaning"))
+)
+
+class ChatCategoryMatcher:
+    """Finds the highest-priority chat category mentioned in a message."""
+
+    def __init__(self, categories: Optional[Iterable[str]] = None, cache_size: int = 4096):
+        # A server without replies for some categories matches only the ones it has,
+        # keeping the shared priority order
+        wanted = None if categories is None else set(categories)
+        table = [(category, keywords) for category, keywords in CHAT_KEYWORDS
+                 if wanted is None or category in wanted]
+
+        # One lookahead alternation finds every keyword occurrence in a single scan.
+        # Alternatives are ordered by category priority, so where keywords overlap at
+        # the same position ("program"/"programming") the higher-priority one is found.
+        self._keyword_category = {}
+        for category, keywords in table:
+            for keyword in keywords:
+                self._keyword_category.setdefault(keyword, category)
+        self._rank = {category: rank for rank, (category, _) in enumerate(table)}
+        self._keyword_re = re.compile(
+            "(?=(" + "|".join(re.escape(keyword) for keyword in self._keyword_category) + "))"
+        )
+        # Common short messages ("hi", "vpn not working") repeat constantly
+        self.match = lru_cache(maxsize=cache_size)(self._match)
+
+    def _match(self, message_lower: str) -> Optional[str]:
+        """Return the highest-priority category with a keyword in the message, or None"""
+        matches = self._keyword_re.findall(message_lower)
+        if not matches:
+            return None
+        return min((self._keyword_category[keyword] for keyword in matches), key=self._rank.__getitem__)
@@ -0,0 +1,66 @@
+"""
+Inverted keyword index shared by the keyword-based classifiers
+"""
+import re
+from typing import Dict, Iterable, List, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z]+")
+
+def argmax(scores: Dict, default=None) -> Tuple:
+    """Return (key, count) for the highest non-negative count; the first key wins ties."""
+    best_key, best_score = default, -1
+    for key, score in scores.items():
+        if score > best_score:
+            best_key, best_score = key, score
+    return best_key, max(best_score, 0)
+
+def keyword_pattern(keywords: Iterable[str]):
+    """Compile a keyword list into one word-bounded alternation regex."""
+    # Longest keywords first so multi-word phrases win over their prefixes
+    alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    return re.compile(r"\b(?:" + alternation + r")\b")
+
+class KeywordIndex:
+    """Maps each keyword to the buckets it scores, built once per keyword table."""
+
+    def __init__(self, keyword_table: Dict):
+        self.buckets = list(keyword_table)
+        self.index: Dict[str, List] = {}
+        phrases = []
+
+        for bucket, keywords in keyword_table.items():
+            for keyword in keywords:
+                self.index.setdefault(keyword, []).append(bucket)
+                if " " in keyword:
+                    phrases.append(keyword)
+
+        # Single words are found by token lookup; only phrases need a regex
+        self._phrases = tuple(sorted(set(phrases)))
+        self._phrase_re = keyword_pattern(self._phrases) if phrases else None
+        self._keywords = frozenset(self.index)
+
+    def matches(self, *texts: str) -> set:
+        """Return the distinct keywords present in any of the already-lowercased texts."""
+        found = set()
+        for text in texts:
+            found.update(_TOKEN_RE.findall(text))
+            # Plain substring search is a C memchr loop; the word-boundary
+            # regex only runs when some phrase is actually present
+            if self._phrase_re and any(phrase in text for phrase in self._phrases):
+                found.update(self._phrase_re.findall(text))
+        # Set intersection runs in C, so Python only iterates real keyword hits
+        found &= self._keywords
+        return found
+
+    def scores(self, *texts: str) -> Dict:
+        """Count distinct keyword matches per bucket across already-lowercased texts."""
+        return self.score_matches(self.matches(*texts))
+
+    def score_matches(self, found: set) -> Dict:
+        """Count matches per bucket from keywords found by this or a wider index."""
+        scores = dict.fromkeys(self.buckets, 0)
+        index = self.index
+        for keyword in self._keywords.intersection(found):
+            for bucket in index[keyword]:
+                scores[bucket] += 1
+        return scores
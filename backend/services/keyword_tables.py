@@ -0,0 +1,94 @@
+"""
+Shared keyword tables for the keyword-based ticket classifiers
+"""
+from typing import Dict, FrozenSet
+
+# SimpleMLService tables
+CATEGORY_KEYWORDS: Dict[str, FrozenSet[str]] = {
+    'performance_issue': frozenset([
+        'slow', 'performance', 'lag', 'timeout', 'cpu', 'memory', 'disk',
+        'bottleneck', 'latency', 'response time', 'speed', 'overload'
+    ]),
+    'bug': frozenset([
+        'error', 'bug', 'crash', 'broken', 'malfunction', 'defect', 'issue',
+        'problem', 'fault', 'failure', 'exception', 'wrong', 'incorrect'
+    ]),
+    'feature_request': frozenset([
+        'feature', 'enhancement', 'improvement', 'add', 'new', 'request',
+        'suggestion', 'capability', 'functionality', 'tool', 'option'
+    ]),
+    'incident': frozenset([
+        'down', 'outage', 'emergency', 'critical', 'urgent', 'system down',
+        'service unavailable', 'production', 'major', 'severe', 'blocking'
+    ])
+}
+
+PRIORITY_KEYWORDS: Dict[str, FrozenSet[str]] = {
+    'critical': frozenset([
+        'critical', 'emergency', 'urgent', 'down', 'outage', 'production',
+        'blocking', 'severe', 'major', 'asap', 'immediately'
+    ]),
+    'high': frozenset([
+        'high', 'important', 'priority', 'soon', 'quickly', 'significant',
+        'affecting', 'impact', 'business'
+    ]),
+    'medium': frozenset([
+        'medium', 'normal', 'standard', 'regular', 'usual', 'typical'
+    ]),
+    'low': frozenset([
+        'low', 'minor', 'small', 'trivial', 'cosmetic', 'nice to have',
+        'when possible', 'eventually'
+    ])
+}
+
+SENTIMENT_KEYWORDS: Dict[str, FrozenSet[str]] = {
+    'positive': frozenset(['good', 'great', 'excellent', 'working', 'fixed', 'resolved', 'thanks', 'appreciate']),
+    'negative': frozenset(['bad', 'terrible', 'awful', 'frustrated', 'angry', 'disappointed', 'annoyed', 'upset']),
+    'neutral': frozenset(['okay', 'fine', 'normal', 'standard', 'regular'])
+}
+
+# TicketTriageService tables, keyed by TicketPriority / TicketCategory values
+TRIAGE_PRIORITY_KEYWORDS: Dict[str, FrozenSet[str]] = {
+    'critical': frozenset([
+        "down", "outage", "critical", "emergency", "urgent", "broken",
+        "not working", "failed", "error", "crash", "fatal"
+    ]),
+    'high': frozenset([
+        "slow", "performance", "issue", "problem", "bug", "not responding",
+        "timeout", "connection", "access", "login", "authentication"
+    ]),
+    'medium': frozenset([
+        "request", "help", "question", "information", "guidance",
+        "how to", "tutorial", "documentation"
+    ]),
+    'low': frozenset([
+        "password", "reset", "change", "update", "modify", "preference",
+        "setting", "configuration"
+    ])
+}
+
+TRIAGE_CATEGORY_KEYWORDS: Dict[str, FrozenSet[str]] = {
+    'system_down': frozenset([
+        "down", "outage", "offline", "unavailable", "not accessible",
+        "server down", "service down", "system down"
+    ]),
+    'performance_issue': frozenset([
+        "slow", "performance", "lag", "timeout", "response time",
+        "bottleneck", "optimization"
+    ]),
+    'password_reset': frozenset([
+        "password", "reset", "forgot", "locked", "unlock", "change password"
+    ]),
+    'software_installation': frozenset([
+        "install", "installation", "setup", "configure", "deploy",
+        "software", "application", "program"
+    ]),
+    'hardware_issue': frozenset([
+        "hardware", "device", "printer", "scanner", "monitor",
+        "keyboard", "mouse", "physical"
+    ]),
+    'network_issue': frozenset([
+        "network", "connection", "wifi", "ethernet", "internet",
+        "connectivity", "dns", "ip", "vpn"
+    ])
+}
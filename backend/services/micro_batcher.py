@@ -0,0 +1,109 @@
+"""
+Micro-batching for upstream API calls
+
+Requests arriving within a short window are drained together and handed to
+one batch handler, so a burst of chat messages is dispatched as a single
+round of concurrent upstream calls instead of one at a time.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch: int = 16,
+        max_wait: float = 0.02
+    ):
+        # handler returns one result (or exception instance) per item, in order
+        self._handler = handler
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: Dict[asyncio.Task, list] = {}
+        self._collecting: list = []
+
+    def _ensure_worker(self):
+        # The queue and worker bind to the running loop, so start them lazily
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result from the next batch"""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self) -> list:
+        # Items are held on self while waiting so close() can fail them
+        self._collecting = batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        self._collecting = []
+        return batch
+
+    async def _run(self):
+        # Batches are dispatched as tasks so one slow batch never holds up
+        # the ones queued behind it
+        while True:
+            batch = await self._collect()
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight[task] = batch
+            task.add_done_callback(lambda t: self._inflight.pop(t, None))
+
+    async def _dispatch(self, batch: list):
+        items = [item for item, _ in batch]
+        try:
+            results = await self._handler(items)
+        except Exception as e:
+            logger.warning(f"Micro-batch of {len(items)} failed: {e}")
+            results = [e] * len(items)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def close(self):
+        inflight = list(self._inflight.items())
+        tasks = [task for task, _ in inflight]
+        if self._worker is not None:
+            tasks.append(self._worker)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker = None
+        self._inflight.clear()
+
+        # Fail anything still waiting so submit() callers are not left hanging
+        pending = self._collecting
+        self._collecting = []
+        for _, batch in inflight:
+            pending.extend(batch)
+        if self._queue is not None:
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+        self._fail(pending, RuntimeError("MicroBatcher closed"))
+
+    @staticmethod
+    def _fail(batch: list, error: BaseException):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
@@ -163,6 +163,13 @@ class MLTicketService:
         except Exception as e:
             print(f"⚠️ Error training models: {e}")
 
+    def analyze(self, title: str, description: str) -> Dict:
+        """Classify a ticket and analyze its sentiment"""
+        return {
+            'classification': self.classify_ticket(title, description),
+            'sentiment': self.analyze_sentiment(f"{title} {description}")
+        }
+
     def classify_ticket(self, title: str, description: str) -> Dict:
         """Classify ticket and predict properties"""
         try:
@@ -214,6 +221,48 @@ class MLTicketService:
                 'ml_confidence': 0.5
             }
 
+    def classify_batch(self, tickets: List[Tuple[str, str]]) -> List[Dict]:
+        """Classify many (title, description) pairs with one vectorize/predict call per model"""
+        if not tickets:
+            return []
+
+        try:
+            texts = [f"{title} {description}".strip() for title, description in tickets]
+            urgency_scores = np.array([self._extract_urgency_keywords(text) for text in texts]).reshape(-1, 1)
+
+            # Vectorize the whole batch in one sparse transform
+            text_vectorized = self.vectorizer.transform(texts)
+            X_combined = np.hstack([text_vectorized.toarray(), urgency_scores])
+
+            # One predict_proba per classifier; the argmax matches predict()
+            category_proba = self.category_classifier.predict_proba(X_combined)
+            priority_proba = self.priority_classifier.predict_proba(X_combined)
+            predicted_categories = self.category_classifier.classes_[category_proba.argmax(axis=1)]
+            predicted_priorities = self.priority_classifier.classes_[priority_proba.argmax(axis=1)]
+            category_confidences = category_proba.max(axis=1)
+            priority_confidences = priority_proba.max(axis=1)
+
+            # Predict resolution times, clamped between 1-48 hours
+            resolution_times = np.clip(self.resolution_time_predictor.predict(X_combined), 1, 48)
+
+            return [
+                {
+                    'category': predicted_categories[i],
+                    'category_confidence': round(float(category_confidences[i]), 3),
+                    'priority': predicted_priorities[i],
+                    'priority_confidence': round(float(priority_confidences[i]), 3),
+                    'predicted_resolution_time_hours': round(float(resolution_times[i]), 1),
+                    'urgency_score': int(urgency_scores[i, 0]),
+                    'auto_categorized': True,
+                    'ml_confidence': round((category_confidences[i] + priority_confidences[i]) / 2, 3)
+                }
+                for i in range(len(texts))
+            ]
+
+        except Exception as e:
+            print(f"⚠️ Error in batch ticket classification: {e}")
+            return [self.classify_ticket(title, description) for title, description in tickets]
+
     def analyze_sentiment(self, text: str) -> Dict:
         """Analyze sentiment of ticket text"""
         try:
@@ -0,0 +1,87 @@
+"""
+Mock dashboard data shared by the simple API servers
+
+Health readings and alerts are sampled from tables built once at import, with
+one NumPy draw per request instead of a random call per field.
+"""
+from datetime import datetime
+import random
+from time import time as wall_time
+from typing import List
+
+import numpy as np
+
+rng = np.random.default_rng()
+
+# Handlers share one ISO timestamp string, reformatted at most every 250 ms
+_clock = ["", 0.0]
+
+def now_iso() -> str:
+    t = wall_time()
+    if t - _clock[1] > 0.25:
+        _clock[0] = datetime.fromtimestamp(t).isoformat()
+        _clock[1] = t
+    return _clock[0]
+
+# Bounds for one vectorized draw: cpu, memory, disk, uptime
+HEALTH_LOW = np.array([20, 30, 10, 24])
+HEALTH_HIGH = np.array([80, 90, 70, 168])
+
+def sample_health() -> dict:
+    """Current system health readings in one uniform draw"""
+    cpu, memory, disk, uptime = rng.uniform(HEALTH_LOW, HEALTH_HIGH).round(1).tolist()
+    return {
+        "cpu_usage": cpu,
+        "memory_usage": memory,
+        "disk_usage": disk,
+        "uptime_hours": uptime,
+        "active_alerts": int(rng.integers(0, 6)),
+        "status": "operational"
+    }
+
+ALERT_TYPES = ("warning", "error", "info")
+ALERT_MESSAGES = (
+    "High CPU usage detected",
+    "Memory usage above threshold",
+    "Disk space running low",
+    "Network connectivity issue",
+    "Service restart required"
+)
+ALERT_SEVERITIES = ("low", "medium", "high", "critical")
+
+# Alerts are drawn from a pool built once; a request takes a run of consecutive
+# entries and only stamps the time. The None timestamp keeps the key order.
+ALERT_POOL_SIZE = 64
+_ALERT_POOL = tuple(
+    {
+        "id": alert_id,
+        "type": ALERT_TYPES[type_index],
+        "message": ALERT_MESSAGES[message_index],
+        "timestamp": None,
+        "severity": ALERT_SEVERITIES[severity_index]
+    }
+    for alert_id, type_index, message_index, severity_index in rng.integers(
+        [1000, 0, 0, 0],
+        [10000, len(ALERT_TYPES), len(ALERT_MESSAGES), len(ALERT_SEVERITIES)],
+        size=(ALERT_POOL_SIZE, 4)
+    ).tolist()
+)
+
+def pool_alerts(count: int, start: int, timestamp: str) -> List[dict]:
+    """count consecutive pool alerts from start, stamped with timestamp"""
+    return [
+        {**_ALERT_POOL[(start + i) % ALERT_POOL_SIZE], "timestamp": timestamp}
+        for i in range(count)
+    ]
+
+def random_alerts(count: int) -> List[dict]:
+    """count fresh mock alerts, each column drawn in one random.choices call"""
+    ids = random.sample(range(1000, 10000), count)
+    types = random.choices(ALERT_TYPES, k=count)
+    messages = random.choices(ALERT_MESSAGES, k=count)
+    severities = random.choices(ALERT_SEVERITIES, k=count)
+    timestamp = now_iso()
+    return [
+        {"id": alert_id, "type": alert_type, "message": message, "timestamp": timestamp, "severity": severity}
+        for alert_id, alert_type, message, severity in zip(ids, types, messages, severities)
+    ]
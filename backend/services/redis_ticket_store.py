@@ -0,0 +1,185 @@
+"""
+Redis-backed ticket store shared by every worker
+
+Each ticket row is a hash at ticket:{id}, ids are ordered in a sorted set and
+each status/priority/category value has an id set, so filters are SINTERs and
+analytics counts are SCARDs no matter which worker handled the write.
+"""
+from typing import Dict, Iterable, List, Optional
+
+import orjson
+
+try:
+    from redis.exceptions import WatchError
+except ImportError:  # Only constructed when redis is installed
+    class WatchError(Exception):
+        pass
+
+from services.ticket_store import INDEXED_FIELDS, _epoch
+
+ORDER_KEY = "tickets:by_created"
+NEXT_ID_KEY = "tickets:next_id"
+VERSION_KEY = "tickets:version"
+RESOLUTION_KEY = "tickets:resolution"
+SEEDED_KEY = "tickets:seeded"
+
+def _row_key(ticket_id: int) -> str:
+    return f"ticket:{ticket_id}"
+
+def _index_key(field: str, value: str) -> str:
+    return f"tickets:{field}:{value}"
+
+def _values_key(field: str) -> str:
+    return f"tickets:values:{field}"
+
+def _resolution_seconds(ticket: dict) -> Optional[float]:
+    if not ticket.get("resolved_at"):
+        return None
+    return _epoch(ticket["resolved_at"]) - _epoch(ticket["created_at"])
+
+class RedisTicketStore:
+    def __init__(self, client):
+        # Raw bytes client; row fields are orjson-encoded individually
+        self._redis = client
+
+    @staticmethod
+    def _encode(fields: dict) -> Dict[str, bytes]:
+        return {field: orjson.dumps(value) for field, value in fields.items()}
+
+    @staticmethod
+    def _decode(row: dict) -> Optional[dict]:
+        if not row:
+            return None
+        return {field.decode(): orjson.loads(value) for field, value in row.items()}
+
+    def _index(self, pipe, ticket: dict):
+        ticket_id = ticket["id"]
+        # Ids are assigned in increasing order, so the id doubles as creation rank
+        pipe.zadd(ORDER_KEY, {ticket_id: ticket_id})
+        for field in INDEXED_FIELDS:
+            pipe.sadd(_index_key(field, ticket[field]), ticket_id)
+            pipe.sadd(_values_key(field), ticket[field])
+        seconds = _resolution_seconds(ticket)
+        if seconds is not None:
+            pipe.hincrbyfloat(RESOLUTION_KEY, "total", seconds)
+            pipe.hincrby(RESOLUTION_KEY, "count", 1)
+
+    def _unindex(self, pipe, ticket: dict):
+        ticket_id = ticket["id"]
+        pipe.zrem(ORDER_KEY, ticket_id)
+        for field in INDEXED_FIELDS:
+            pipe.srem(_index_key(field, ticket[field]), ticket_id)
+        seconds = _resolution_seconds(ticket)
+        if seconds is not None:
+            pipe.hincrbyfloat(RESOLUTION_KEY, "total", -seconds)
+            pipe.hincrby(RESOLUTION_KEY, "count", -1)
+
+    async def seed(self, tickets: Iterable[dict]):
+        """Load initial tickets once; later workers find the data already there"""
+        if not await self._redis.setnx(SEEDED_KEY, 1):
+            return
+        tickets = list(tickets)
+        pipe = self._redis.pipeline(transaction=True)
+        for ticket in tickets:
+            pipe.hset(_row_key(ticket["id"]), mapping=self._encode(ticket))
+            self._index(pipe, ticket)
+        pipe.set(NEXT_ID_KEY, max((t["id"] for t in tickets), default=0))
+        pipe.incr(VERSION_KEY)
+        await pipe.execute()
+
+    async def version(self) -> int:
+        """Mutation counter shared across workers, for cache invalidation"""
+        return int(await self._redis.get(VERSION_KEY) or 0)
+
+    async def size(self) -> int:
+        return await self._redis.zcard(ORDER_KEY)
+
+    async def next_id(self) -> int:
+        """Reserve the id for a ticket about to be added"""
+        return await self._redis.incr(NEXT_ID_KEY)
+
+    async def get(self, ticket_id: int) -> Optional[dict]:
+        return self._decode(await self._redis.hgetall(_row_key(ticket_id)))
+
+    async def add(self, ticket: dict) -> dict:
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hset(_row_key(ticket["id"]), mapping=self._encode(ticket))
+        self._index(pipe, ticket)
+        pipe.incr(VERSION_KEY)
+        await pipe.execute()
+        return ticket
+
+    async def _mutate(self, ticket_id: int, apply) -> Optional[dict]:
+        """Re-read a row under WATCH and queue apply's writes in one MULTI,
+        retrying if another worker touched the row in between"""
+        key = _row_key(ticket_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    ticket = self._decode(await pipe.hgetall(key))
+                    if ticket is None:
+                        await pipe.unwatch()
+                        return None
+                    pipe.multi()
+                    result = apply(pipe, ticket)
+                    pipe.incr(VERSION_KEY)
+                    await pipe.execute()
+                    return result
+                except WatchError:
+                    continue
+
+    async def update(self, ticket_id: int, changes: dict) -> Optional[dict]:
+        """Apply field changes to a ticket and move it between index sets"""
+        def apply(pipe, ticket: dict) -> dict:
+            updated = {**ticket, **changes}
+            self._unindex(pipe, ticket)
+            pipe.hset(_row_key(ticket_id), mapping=self._encode(changes))
+            self._index(pipe, updated)
+            return updated
+
+        return await self._mutate(ticket_id, apply)
+
+    async def delete(self, ticket_id: int) -> Optional[dict]:
+        def apply(pipe, ticket: dict) -> dict:
+            self._unindex(pipe, ticket)
+            pipe.delete(_row_key(ticket_id))
+            return ticket
+
+        return await self._mutate(ticket_id, apply)
+
+    async def filter(self, **criteria: Optional[str]) -> List[dict]:
+        """Tickets matching every given indexed field value, in creation order"""
+        keys = [_index_key(field, value) for field, value in criteria.items() if value is not None]
+        if keys:
+            ids = sorted(int(ticket_id) for ticket_id in await self._redis.sinter(keys))
+        else:
+            ids = [int(ticket_id) for ticket_id in await self._redis.zrange(ORDER_KEY, 0, -1)]
+
+        pipe = self._redis.pipeline(transaction=False)
+        for ticket_id in ids:
+            pipe.hgetall(_row_key(ticket_id))
+        rows = await pipe.execute() if ids else []
+        return [ticket for ticket in map(self._decode, rows) if ticket is not None]
+
+    async def avg_resolution_hours(self) -> float:
+        """Mean created-to-resolved time over tickets with a resolved_at"""
+        total, count = await self._redis.hmget(RESOLUTION_KEY, "total", "count")
+        if not count or int(count) <= 0:
+            return 0
+        return float(total) / int(count) / 3600
+
+    async def count(self, field: str, value: str) -> int:
+        return await self._redis.scard(_index_key(field, value))
+
+    async def counts(self, field: str) -> Dict[str, int]:
+        """Ticket count per value of an indexed field, skipping emptied values"""
+        values = sorted(value.decode() for value in await self._redis.smembers(_values_key(field)))
+        pipe = self._redis.pipeline(transaction=False)
+        for value in values:
+            pipe.scard(_index_key(field, value))
+        sizes = await pipe.execute() if values else []
+        return {value: size for value, size in zip(values, sizes) if size}
+
+    async def close(self):
+        await self._redis.aclose()
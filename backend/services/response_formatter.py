@@ -0,0 +1,38 @@
+"""
+Markdown-to-HTML formatting for chatbot replies
+
+LLM replies use **bold**, *emphasis*, "•"/"-" bullets and numbered steps.
+Each construct is converted by one precompiled regex pass over the whole
+reply instead of a Python loop over its lines.
+"""
+import re
+
+_LINE_EDGES = re.compile(r"^[ \t]+|[ \t]+$", re.M)
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_EM = re.compile(r"(?<![*\w])\*(?=\S)(.+?)(?<=\S)\*(?![*\w])")
+# A run of bullet lines or a run of numbered lines, found in the same pass
+_LIST_BLOCK = re.compile(r"(?:^[•-] .*(?:\n|$))+|(?:^\d+\. .*(?:\n|$))+", re.M)
+_LIST_ITEM = re.compile(r"^(?:[•-]|\d+\.) (.*)$", re.M)
+_PARAGRAPH = re.compile(r"^(?!</?[uo]l>|<li>)(.+)$", re.M)
+_BLANK_LINES = re.compile(r"\n{2,}")
+
+def _wrap_list(match: re.Match) -> str:
+    block = match.group(0)
+    tag = "ol" if block[0].isdigit() else "ul"
+    items = _LIST_ITEM.sub(r"<li>\1</li>", block.rstrip("\n"))
+    return f"<{tag}>\n{items}\n</{tag}>\n"
+
+def format_response(text: str) -> str:
+    """Format the AI response with proper HTML-like formatting for better display"""
+    formatted = _LINE_EDGES.sub("", text)
+
+    # Convert markdown-style emphasis to HTML
+    formatted = _BOLD.sub(r"<strong>\1</strong>", formatted)
+    formatted = _EM.sub(r"<em>\1</em>", formatted)
+
+    # Convert bullet and numbered runs to proper HTML lists
+    formatted = _LIST_BLOCK.sub(_wrap_list, formatted)
+
+    # Every other non-empty line becomes a paragraph
+    formatted = _PARAGRAPH.sub(r"<p>\1</p>", formatted)
+    return _BLANK_LINES.sub("\n", formatted).strip("\n")
@@ -0,0 +1,122 @@
+"""
+Semantic response cache for LLM chat calls
+
+Near-duplicate questions ("reset my password" / "how do I reset password")
+are answered from cache when their embeddings are close enough, so only
+genuinely new questions reach the LLM.
+"""
+import hashlib
+import json
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # Redis is optional; the in-process cache works without it
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+class SemanticCache:
+    def __init__(
+        self,
+        embed: Callable[[str], Awaitable[List[float]]],
+        threshold: float = 0.92,
+        max_entries: int = 1024,
+        redis_url: Optional[str] = None,
+        ttl_seconds: int = 3600,
+        namespace: str = "chat_cache"
+    ):
+        self._embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+
+        # Ring buffer of L2-normalized embeddings, allocated on first insert
+        self._embeddings: Optional[np.ndarray] = None
+        self._responses: List[Optional[str]] = [None] * max_entries
+        self._size = 0
+        self._next = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        # Exact-match sharing across workers when Redis is configured
+        self._redis = redis.from_url(redis_url) if redis_url and redis else None
+
+    def _redis_key(self, message: str) -> str:
+        normalized = " ".join(message.lower().split())
+        return f"{self.namespace}:{hashlib.sha256(normalized.encode()).hexdigest()}"
+
+    def _nearest(self, query: np.ndarray) -> Optional[str]:
+        """Return the cached response most similar to query above the threshold"""
+        if not self._size:
+            return None
+        scores = self._embeddings[:self._size] @ query
+        best = int(scores.argmax())
+        return self._responses[best] if scores[best] >= self.threshold else None
+
+    def _store(self, query: np.ndarray, response: str):
+        if self._embeddings is None:
+            self._embeddings = np.zeros((self.max_entries, query.shape[0]), dtype=np.float32)
+        # Overwrite the oldest entry once the buffer is full
+        self._embeddings[self._next] = query
+        self._responses[self._next] = response
+        self._next = (self._next + 1) % self.max_entries
+        self._size = min(self._size + 1, self.max_entries)
+
+    async def get_or_compute(self, message: str, compute: Callable[[str], Awaitable[str]]) -> str:
+        """Return a cached response for message, or compute and cache a new one"""
+        if self._redis is not None:
+            try:
+                cached = await self._redis.get(self._redis_key(message))
+                if cached is not None:
+                    self.hits += 1
+                    return json.loads(cached)["response"]
+            except Exception as e:
+                logger.warning(f"Semantic cache Redis lookup failed: {e}")
+
+        try:
+            query = np.asarray(await self._embed(message), dtype=np.float32)
+            query = query / (np.linalg.norm(query) or 1.0)
+        except Exception as e:
+            # Without an embedding the cache cannot help; answer directly
+            logger.warning(f"Semantic cache embedding failed: {e}")
+            self.misses += 1
+            return await compute(message)
+
+        cached = self._nearest(query)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        response = await compute(message)
+        self._store(query, response)
+
+        if self._redis is not None:
+            try:
+                await self._redis.set(
+                    self._redis_key(message),
+                    json.dumps({"response": response}),
+                    ex=self.ttl_seconds
+                )
+            except Exception as e:
+                logger.warning(f"Semantic cache Redis write failed: {e}")
+
+        return response
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "entries": self._size,
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "shared": self._redis is not None
+        }
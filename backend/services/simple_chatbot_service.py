@@ -2,6 +2,7 @@
 Simple chatbot service without Prisma dependencies
 """
 import logging
+import re
 from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
@@ -17,19 +18,27 @@ class SimpleChatbotService:
             "error": "I understand you're experiencing an error. Can you provide more details about what happened?"
         }
 
+        # One scan over the message finds every keyword occurrence (overlaps
+        # included via lookahead); earlier table entries keep precedence
+        self._keyword_rank = {keyword: rank for rank, keyword in enumerate(self.responses)}
+        self._keyword_re = re.compile(
+            "(?=(" + "|".join(re.escape(keyword) for keyword in self.responses) + "))"
+        )
+
     async def process_message(self, message: str, user_id: Optional[int] = None) -> Dict[str, Any]:
         """Process a chatbot message and return a response"""
         try:
             message_lower = message.lower()
 
             # Simple keyword matching
-            for keyword, response in self.responses.items():
-                if keyword in message_lower:
-                    return {
-                        "response": response,
-                        "confidence": 0.8,
-                        "escalated": False
-                    }
+            matches = self._keyword_re.findall(message_lower)
+            if matches:
+                keyword = min(matches, key=self._keyword_rank.__getitem__)
+                return {
+                    "response": self.responses[keyword],
+                    "confidence": 0.8,
+                    "escalated": False
+                }
 
             # Default response
             return {
@@ -3,175 +3,234 @@ Simplified Machine Learning Service for IT Support System
 Lightweight version with basic ML capabilities
 """
 
+import array
 import re
 import json
+from collections import Counter
+from collections.abc import Sized
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple, Optional
 import random
 
+from services.keyword_index import KeywordIndex, argmax
+from services.keyword_tables import CATEGORY_KEYWORDS, PRIORITY_KEYWORDS, SENTIMENT_KEYWORDS
+
+_CATEGORY_INDEX = KeywordIndex(CATEGORY_KEYWORDS)
+_PRIORITY_INDEX = KeywordIndex(PRIORITY_KEYWORDS)
+_SENTIMENT_INDEX = KeywordIndex(SENTIMENT_KEYWORDS)
+
+# Every keyword from all three tables, so the fused analysis tokenizes once
+_ANALYSIS_INDEX = KeywordIndex({
+    'any': frozenset().union(
+        *CATEGORY_KEYWORDS.values(), *PRIORITY_KEYWORDS.values(), *SENTIMENT_KEYWORDS.values()
+    )
+})
+
+# Classification tuning: confidence per matched keyword, clamped to a range
+_CATEGORY_CONFIDENCE_COEF = 0.2
+_PRIORITY_CONFIDENCE_COEF = 0.25
+_MIN_CONFIDENCE = 0.3
+_MAX_CONFIDENCE = 0.9
+
+# Base resolution time per priority, clamped after jitter
+_BASE_RESOLUTION_HOURS = {'critical': 2, 'high': 6, 'medium': 12, 'low': 24}
+_MIN_RESOLUTION_HOURS = 1
+_MAX_RESOLUTION_HOURS = 48
+
+# Fallback results for the error branches; callers receive copies
+_DEFAULT_CLASSIFICATION = {
+    'category': 'other',
+    'category_confidence': 0.5,
+    'priority': 'medium',
+    'priority_confidence': 0.5,
+    'predicted_resolution_time_hours': 8.0,
+    'urgency_score': 0,
+    'auto_categorized': False,
+    'ml_confidence': 0.5
+}
+
+_DEFAULT_SENTIMENT = {
+    'sentiment': 'neutral',
+    'sentiment_score': 0.0,
+    'satisfaction_score': 0.5,
+    'emotional_intensity': 0.5,
+    'is_urgent_emotional': False,
+    'customer_mood': 'neutral'
+}
+
+# Resolution-time jitter drawn once at import; tickets index it by text hash
+_JITTER_MASK = 1023
+_JITTER = array.array('d', [random.uniform(-1, 3) for _ in range(_JITTER_MASK + 1)])
+
+def _classification(title: str, description: str, category_scores: Dict, priority_scores: Dict) -> Dict:
+    """Build the classification result from category and priority keyword scores"""
+    # Category classification
+    predicted_category, category_score = argmax(category_scores, 'other')
+    category_confidence = min(_MAX_CONFIDENCE, max(_MIN_CONFIDENCE, category_score * _CATEGORY_CONFIDENCE_COEF))
+
+    # Priority classification
+    predicted_priority, priority_score = argmax(priority_scores, 'medium')
+    priority_confidence = min(_MAX_CONFIDENCE, max(_MIN_CONFIDENCE, priority_score * _PRIORITY_CONFIDENCE_COEF))
+
+    # Resolution time prediction (based on priority and category)
+    predicted_resolution_time = _BASE_RESOLUTION_HOURS.get(predicted_priority, 8)
+
+    # Add some variation, picked per ticket text from the precomputed jitter table
+    predicted_resolution_time += _JITTER[hash((title, description)) & _JITTER_MASK]
+    predicted_resolution_time = max(_MIN_RESOLUTION_HOURS, min(_MAX_RESOLUTION_HOURS, predicted_resolution_time))
+
+    return {
+        'category': predicted_category,
+        'category_confidence': round(category_confidence, 3),
+        'priority': predicted_priority,
+        'priority_confidence': round(priority_confidence, 3),
+        'predicted_resolution_time_hours': round(predicted_resolution_time, 1),
+        'urgency_score': priority_score,
+        'auto_categorized': True,
+        'ml_confidence': round((category_confidence + priority_confidence) / 2, 3)
+    }
+
+def _sentiment(sentiment_scores: Dict) -> Dict:
+    """Build the sentiment result from sentiment keyword scores"""
+    # Determine overall sentiment
+    if sentiment_scores.get('negative', 0) > sentiment_scores.get('positive', 0):
+        sentiment = 'negative'
+        sentiment_score = -0.5
+    elif sentiment_scores.get('positive', 0) > sentiment_scores.get('negative', 0):
+        sentiment = 'positive'
+        sentiment_score = 0.5
+    else:
+        sentiment = 'neutral'
+        sentiment_score = 0.0
+
+    # Calculate satisfaction score
+    satisfaction_score = (sentiment_score + 1) / 2
+
+    # Determine customer mood
+    if sentiment_score < -0.3:
+        customer_mood = 'frustrated'
+    elif sentiment_score < -0.1:
+        customer_mood = 'concerned'
+    elif sentiment_score < 0.1:
+        customer_mood = 'neutral'
+    elif sentiment_score < 0.3:
+        customer_mood = 'hopeful'
+    else:
+        customer_mood = 'satisfied'
+
+    return {
+        'sentiment': sentiment,
+        'sentiment_score': round(sentiment_score, 3),
+        'satisfaction_score': round(satisfaction_score, 3),
+        'emotional_intensity': 0.5,  # Simplified
+        'is_urgent_emotional': sentiment_score < -0.3,
+        'customer_mood': customer_mood
+    }
+
+@lru_cache(maxsize=4096)
+def _classify_cached(title: str, description: str) -> Dict:
+    """Keyword classification memoized on the ticket text"""
+    # Scan title and description separately rather than concatenating them
+    title_lower = title.lower()
+    description_lower = description.lower()
+
+    return _classification(
+        title, description,
+        _CATEGORY_INDEX.scores(title_lower, description_lower),
+        _PRIORITY_INDEX.scores(title_lower, description_lower)
+    )
+
+@lru_cache(maxsize=4096)
+def _analyze_sentiment_cached(text: str) -> Dict:
+    """Sentiment analysis memoized on the input text"""
+    return _sentiment(_SENTIMENT_INDEX.scores(text.lower()))
+
+@lru_cache(maxsize=4096)
+def _analyze_cached(title: str, description: str) -> Dict:
+    """Classification and sentiment from one scan of the ticket text"""
+    found = _ANALYSIS_INDEX.matches(title.lower(), description.lower())
+
+    return {
+        'classification': _classification(
+            title, description,
+            _CATEGORY_INDEX.score_matches(found),
+            _PRIORITY_INDEX.score_matches(found)
+        ),
+        'sentiment': _sentiment(_SENTIMENT_INDEX.score_matches(found))
+    }
+
 class SimpleMLService:
     def __init__(self):
         # Keyword-based classification (lightweight ML alternative)
-        self.category_keywords = {
-            'performance_issue': [
-                'slow', 'performance', 'lag', 'timeout', 'cpu', 'memory', 'disk',
-                'bottleneck', 'latency', 'response time', 'speed', 'overload'
-            ],
-            'bug': [
-                'error', 'bug', 'crash', 'broken', 'malfunction', 'defect', 'issue',
-                'problem', 'fault', 'failure', 'exception', 'wrong', 'incorrect'
-            ],
-            'feature_request': [
-                'feature', 'enhancement', 'improvement', 'add', 'new', 'request',
-                'suggestion', 'capability', 'functionality', 'tool', 'option'
-            ],
-            'incident': [
-                'down', 'outage', 'emergency', 'critical', 'urgent', 'system down',
-                'service unavailable', 'production', 'major', 'severe', 'blocking'
-            ]
-        }
-
-        self.priority_keywords = {
-            'critical': [
-                'critical', 'emergency', 'urgent', 'down', 'outage', 'production',
-                'blocking', 'severe', 'major', 'asap', 'immediately'
-            ],
-            'high': [
-                'high', 'important', 'priority', 'soon', 'quickly', 'significant',
-                'affecting', 'impact', 'business'
-            ],
-            'medium': [
-                'medium', 'normal', 'standard', 'regular', 'usual', 'typical'
-            ],
-            'low': [
-                'low', 'minor', 'small', 'trivial', 'cosmetic', 'nice to have',
-                'when possible', 'eventually'
-            ]
-        }
+        self.category_keywords = CATEGORY_KEYWORDS
+        self.priority_keywords = PRIORITY_KEYWORDS
 
         # Sentiment keywords
-        self.sentiment_keywords = {
-            'positive': ['good', 'great', 'excellent', 'working', 'fixed', 'resolved', 'thanks', 'appreciate'],
-            'negative': ['bad', 'terrible', 'awful', 'frustrated', 'angry', 'disappointed', 'annoyed', 'upset'],
-            'neutral': ['okay', 'fine', 'normal', 'standard', 'regular']
-        }
-
-    def classify_ticket(self, title: str, description: str) -> Dict:
-        """Classify ticket using keyword-based approach"""
-        try:
-            combined_text = f"{title} {description}".lower()
-
-            # Category classification
-            category_scores = {}
-            for category, keywords in self.category_keywords.items():
-                score = sum(1 for keyword in keywords if keyword in combined_text)
-                category_scores[category] = score
-
-            predicted_category = max(category_scores, key=category_scores.get) if category_scores else 'other'
-            category_confidence = min(0.9, max(0.3, category_scores.get(predicted_category, 0) * 0.2))
-
-            # Priority classification
-            priority_scores = {}
-            for priority, keywords in self.priority_keywords.items():
-                score = sum(1 for keyword in keywords if keyword in combined_text)
-                priority_scores[priority] = score
-
-            predicted_priority = max(priority_scores, key=priority_scores.get) if priority_scores else 'medium'
-            priority_confidence = min(0.9, max(0.3, priority_scores.get(predicted_priority, 0) * 0.25))
+        self.sentiment_keywords = SENTIMENT_KEYWORDS
 
-            # Resolution time prediction (based on priority and category)
-            base_time = {'critical': 2, 'high': 6, 'medium': 12, 'low': 24}
-            predicted_resolution_time = base_time.get(predicted_priority, 8)
-
-            # Add some variation
-            predicted_resolution_time += random.uniform(-1, 3)
-            predicted_resolution_time = max(1, min(48, predicted_resolution_time))
+        # Inverted keyword -> bucket indexes, shared by every instance
+        self._category_index = _CATEGORY_INDEX
+        self._priority_index = _PRIORITY_INDEX
+        self._sentiment_index = _SENTIMENT_INDEX
 
+    def analyze(self, title: str, description: str) -> Dict:
+        """Classify a ticket and analyze its sentiment in a single keyword scan"""
+        try:
+            result = _analyze_cached(title, description)
             return {
-                'category': predicted_category,
-                'category_confidence': round(category_confidence, 3),
-                'priority': predicted_priority,
-                'priority_confidence': round(priority_confidence, 3),
-                'predicted_resolution_time_hours': round(predicted_resolution_time, 1),
-                'urgency_score': priority_scores.get(predicted_priority, 0),
-                'auto_categorized': True,
-                'ml_confidence': round((category_confidence + priority_confidence) / 2, 3)
+                'classification': dict(result['classification']),
+                'sentiment': dict(result['sentiment'])
             }
 
         except Exception as e:
-            print(f"⚠️ Error in ticket classification: {e}")
+            print(f"⚠️ Error in ticket analysis: {e}")
             return {
-                'category': 'other',
-                'category_confidence': 0.5,
-                'priority': 'medium',
-                'priority_confidence': 0.5,
-                'predicted_resolution_time_hours': 8.0,
-                'urgency_score': 0,
-                'auto_categorized': False,
-                'ml_confidence': 0.5
+                'classification': dict(_DEFAULT_CLASSIFICATION),
+                'sentiment': dict(_DEFAULT_SENTIMENT)
             }
 
+    def classify_ticket(self, title: str, description: str) -> Dict:
+        """Classify ticket using keyword-based approach"""
+        try:
+            return dict(_classify_cached(title, description))
+
+        except Exception as e:
+            print(f"⚠️ Error in ticket classification: {e}")
+            return dict(_DEFAULT_CLASSIFICATION)
+
+    def classify_batch(self, tickets: List[Tuple[str, str]]) -> List[Dict]:
+        """Classify many (title, description) pairs; repeated texts hit the classification cache"""
+        return [self.classify_ticket(title, description) for title, description in tickets]
+
     def analyze_sentiment(self, text: str) -> Dict:
         """Analyze sentiment using keyword-based approach"""
         try:
-            text_lower = text.lower()
-
-            # Count sentiment keywords
-            sentiment_scores = {}
-            for sentiment, keywords in self.sentiment_keywords.items():
-                score = sum(1 for keyword in keywords if keyword in text_lower)
-                sentiment_scores[sentiment] = score
-
-            # Determine overall sentiment
-            if sentiment_scores.get('negative', 0) > sentiment_scores.get('positive', 0):
-                sentiment = 'negative'
-                sentiment_score = -0.5
-            elif sentiment_scores.get('positive', 0) > sentiment_scores.get('negative', 0):
-                sentiment = 'positive'
-                sentiment_score = 0.5
-            else:
-                sentiment = 'neutral'
-                sentiment_score = 0.0
-
-            # Calculate satisfaction score
-            satisfaction_score = (sentiment_score + 1) / 2
-
-            # Determine customer mood
-            if sentiment_score < -0.3:
-                customer_mood = 'frustrated'
-            elif sentiment_score < -0.1:
-                customer_mood = 'concerned'
-            elif sentiment_score < 0.1:
-                customer_mood = 'neutral'
-            elif sentiment_score < 0.3:
-                customer_mood = 'hopeful'
-            else:
-                customer_mood = 'satisfied'
-
-            return {
-                'sentiment': sentiment,
-                'sentiment_score': round(sentiment_score, 3),
-                'satisfaction_score': round(satisfaction_score, 3),
-                'emotional_intensity': 0.5,  # Simplified
-                'is_urgent_emotional': sentiment_score < -0.3,
-                'customer_mood': customer_mood
-            }
+            return dict(_analyze_sentiment_cached(text))
 
         except Exception as e:
             print(f"⚠️ Error in sentiment analysis: {e}")
-            return {
-                'sentiment': 'neutral',
-                'sentiment_score': 0.0,
-                'satisfaction_score': 0.5,
-                'emotional_intensity': 0.5,
-                'is_urgent_emotional': False,
-                'customer_mood': 'neutral'
-            }
+            return dict(_DEFAULT_SENTIMENT)
 
-    def predict_ticket_trends(self, tickets_data: List[Dict]) -> Dict:
-        """Predict ticket trends and insights"""
+    def predict_ticket_trends(self, tickets_data: Iterable[Dict]) -> Dict:
+        """Predict ticket trends and insights (accepts any iterable, including generators)"""
+        total_tickets = 0
         try:
-            if not tickets_data:
+            # Single pass: ticket count, resolution time total and category/priority counts
+            category_counts = Counter()
+            priority_counts = Counter()
+            resolution_time_total = 0.0
+            for ticket in tickets_data:
+                total_tickets += 1
+                category_counts[ticket.get('category', 'other')] += 1
+                priority_counts[ticket.get('priority', 'medium')] += 1
+                ml_analysis = ticket.get('ml_analysis')
+                if ml_analysis and 'predicted_resolution_time_hours' in ml_analysis:
+                    resolution_time_total += ml_analysis['predicted_resolution_time_hours']
+                else:
+                    resolution_time_total += 8.0  # Default
+
+            if not total_tickets:
                 return {
                     'total_tickets': 0,
                     'avg_resolution_time': 0,
@@ -181,33 +240,10 @@ class SimpleMLService:
                     'recommendations': []
                 }
 
-            # Analyze ticket patterns
-            total_tickets = len(tickets_data)
-
-            # Calculate average resolution time
-            resolution_times = []
-            for ticket in tickets_data:
-                if 'ml_analysis' in ticket and 'predicted_resolution_time_hours' in ticket['ml_analysis']:
-                    resolution_times.append(ticket['ml_analysis']['predicted_resolution_time_hours'])
-                else:
-                    resolution_times.append(8.0)  # Default
-
-            avg_resolution_time = sum(resolution_times) / len(resolution_times) if resolution_times else 8.0
-
-            # Analyze categories
-            category_counts = {}
-            for ticket in tickets_data:
-                category = ticket.get('category', 'other')
-                category_counts[category] = category_counts.get(category, 0) + 1
+            avg_resolution_time = resolution_time_total / total_tickets
 
             # Get top 3 categories
-            common_issues = dict(sorted(category_counts.items(), key=lambda x: x[1], reverse=True)[:3])
-
-            # Analyze priorities
-            priority_counts = {}
-            for ticket in tickets_data:
-                priority = ticket.get('priority', 'medium')
-                priority_counts[priority] = priority_counts.get(priority, 0) + 1
+            common_issues = dict(category_counts.most_common(3))
 
             priority_dist = {k: v/total_tickets for k, v in priority_counts.items()}
 
@@ -228,7 +264,7 @@ class SimpleMLService:
                 'priority_distribution': priority_dist,
                 'recommendations': recommendations,
                 'ml_insights': {
-                    'category_trends': category_counts,
+                    'category_trends': dict(category_counts),
                     'efficiency_score': max(0, min(100, 100 - avg_resolution_time * 5)),
                     'workload_indicator': 'high' if total_tickets > 10 else 'normal'
                 }
@@ -237,14 +273,14 @@ class SimpleMLService:
         except Exception as e:
             print(f"⚠️ Error in trend prediction: {e}")
             return {
-                'total_tickets': len(tickets_data) if tickets_data else 0,
+                'total_tickets': len(tickets_data) if isinstance(tickets_data, Sized) else total_tickets,
                 'avg_resolution_time': 8.0,
                 'trend_prediction': 'stable',
                 'common_issues': {},
                 'recommendations': []
             }
 
-    def get_ml_insights(self, tickets_data: List[Dict]) -> Dict:
+    def get_ml_insights(self, tickets_data: Iterable[Dict]) -> Dict:
         """Get comprehensive ML insights for dashboard"""
         try:
             insights = {
@@ -0,0 +1,166 @@
+"""
+In-memory ticket store with secondary indexes
+
+Tickets are kept in an id map plus per-status/priority/category id sets, so
+lookups, filters and analytics counts are hash lookups instead of scans.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+INDEXED_FIELDS = ("status", "priority", "category")
+
+def _epoch(timestamp: str) -> float:
+    """Epoch seconds for an ISO timestamp, accepting a trailing Z"""
+    if timestamp.endswith("Z"):
+        timestamp = timestamp[:-1] + "+00:00"
+    return datetime.fromisoformat(timestamp).timestamp()
+
+class TicketStore:
+    def __init__(self, tickets: Iterable[dict] = ()):
+        self._by_id: Dict[int, dict] = {}
+        self._indexes: Dict[str, Dict[str, Set[int]]] = {
+            field: defaultdict(set) for field in INDEXED_FIELDS
+        }
+        self._next_id = 1
+        # Resolution durations parsed once per mutation, with a running sum
+        self._resolution_seconds: Dict[int, float] = {}
+        self._resolution_total = 0.0
+        for ticket in tickets:
+            self.add(ticket)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._by_id.values())
+
+    def _index(self, ticket: dict):
+        for field in INDEXED_FIELDS:
+            self._indexes[field][ticket[field]].add(ticket["id"])
+        if ticket.get("resolved_at"):
+            seconds = _epoch(ticket["resolved_at"]) - _epoch(ticket["created_at"])
+            self._resolution_seconds[ticket["id"]] = seconds
+            self._resolution_total += seconds
+
+    def _unindex(self, ticket: dict):
+        for field in INDEXED_FIELDS:
+            self._indexes[field][ticket[field]].discard(ticket["id"])
+        seconds = self._resolution_seconds.pop(ticket["id"], None)
+        if seconds is not None:
+            self._resolution_total -= seconds
+
+    def next_id(self) -> int:
+        return self._next_id
+
+    def get(self, ticket_id: int) -> Optional[dict]:
+        return self._by_id.get(ticket_id)
+
+    def add(self, ticket: dict) -> dict:
+        self._by_id[ticket["id"]] = ticket
+        self._index(ticket)
+        self._next_id = max(self._next_id, ticket["id"] + 1)
+        return ticket
+
+    def update(self, ticket_id: int, changes: dict) -> Optional[dict]:
+        """Apply field changes to a ticket and re-index it"""
+        ticket = self._by_id.get(ticket_id)
+        if ticket is None:
+            return None
+        self._unindex(ticket)
+        ticket.update(changes)
+        self._index(ticket)
+        return ticket
+
+    def delete(self, ticket_id: int) -> Optional[dict]:
+        ticket = self._by_id.pop(ticket_id, None)
+        if ticket is not None:
+            self._unindex(ticket)
+        return ticket
+
+    def ids_where(self, field: str, value: str) -> Set[int]:
+        return self._indexes[field].get(value, set())
+
+    def filter(self, **criteria: Optional[str]) -> List[dict]:
+        """Tickets matching every given indexed field value, in creation order"""
+        ids = None
+        for field, value in criteria.items():
+            if value is None:
+                continue
+            matched = self.ids_where(field, value)
+            ids = matched if ids is None else ids & matched
+        if ids is None:
+            return list(self._by_id.values())
+        # Ids are assigned in increasing order, so sorting restores creation order
+        return [self._by_id[ticket_id] for ticket_id in sorted(ids)]
+
+    def avg_resolution_hours(self) -> float:
+        """Mean created-to-resolved time over tickets with a resolved_at"""
+        if not self._resolution_seconds:
+            return 0
+        return self._resolution_total / len(self._resolution_seconds) / 3600
+
+    def count(self, field: str, value: str) -> int:
+        return len(self.ids_where(field, value))
+
+    def counts(self, field: str) -> Dict[str, int]:
+        """Ticket count per value of an indexed field, skipping emptied values"""
+        return {value: len(ids) for value, ids in self._indexes[field].items() if ids}
+
+class AsyncTicketStore:
+    """Awaitable in-process TicketStore, interchangeable with RedisTicketStore"""
+
+    def __init__(self, store: Optional[TicketStore] = None):
+        self._store = store if store is not None else TicketStore()
+        self._version = 0
+
+    async def seed(self, tickets: Iterable[dict]):
+        """Load initial tickets unless the store already holds some"""
+        if len(self._store):
+            return
+        for ticket in tickets:
+            self._store.add(ticket)
+        self._version += 1
+
+    async def version(self) -> int:
+        return self._version
+
+    async def size(self) -> int:
+        return len(self._store)
+
+    async def next_id(self) -> int:
+        return self._store.next_id()
+
+    async def get(self, ticket_id: int) -> Optional[dict]:
+        return self._store.get(ticket_id)
+
+    async def add(self, ticket: dict) -> dict:
+        self._version += 1
+        return self._store.add(ticket)
+
+    async def update(self, ticket_id: int, changes: dict) -> Optional[dict]:
+        ticket = self._store.update(ticket_id, changes)
+        if ticket is not None:
+            self._version += 1
+        return ticket
+
+    async def delete(self, ticket_id: int) -> Optional[dict]:
+        ticket = self._store.delete(ticket_id)
+        if ticket is not None:
+            self._version += 1
+        return ticket
+
+    async def filter(self, **criteria: Optional[str]) -> List[dict]:
+        return self._store.filter(**criteria)
+
+    async def avg_resolution_hours(self) -> float:
+        return self._store.avg_resolution_hours()
+
+    async def count(self, field: str, value: str) -> int:
+        return self._store.count(field, value)
+
+    async def counts(self, field: str) -> Dict[str, int]:
+        return self._store.counts(field)
+
+    async def close(self):
+        pass
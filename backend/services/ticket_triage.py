@@ -1,56 +1,26 @@
-import re
+from functools import lru_cache
 from typing import Dict, Any
 from database.models.ticket import TicketPriority, TicketCategory
+from services.keyword_index import KeywordIndex, argmax
+from services.keyword_tables import TRIAGE_PRIORITY_KEYWORDS, TRIAGE_CATEGORY_KEYWORDS
+
+# Keyword tables keyed by enum, indexed once per process rather than per instance
+_PRIORITY_KEYWORDS = {TicketPriority(k): v for k, v in TRIAGE_PRIORITY_KEYWORDS.items()}
+_CATEGORY_KEYWORDS = {TicketCategory(k): v for k, v in TRIAGE_CATEGORY_KEYWORDS.items()}
+_PRIORITY_INDEX = KeywordIndex(_PRIORITY_KEYWORDS)
+_CATEGORY_INDEX = KeywordIndex(_CATEGORY_KEYWORDS)
 
 class TicketTriageService:
     """Service for automatically triaging tickets based on content analysis."""
 
     def __init__(self):
         # Define keywords and patterns for each category and priority
-        self.priority_keywords = {
-            TicketPriority.CRITICAL: [
-                "down", "outage", "critical", "emergency", "urgent", "broken",
-                "not working", "failed", "error", "crash", "fatal"
-            ],
-            TicketPriority.HIGH: [
-                "slow", "performance", "issue", "problem", "bug", "not responding",
-                "timeout", "connection", "access", "login", "authentication"
-            ],
-            TicketPriority.MEDIUM: [
-                "request", "help", "question", "information", "guidance",
-                "how to", "tutorial", "documentation"
-            ],
-            TicketPriority.LOW: [
-                "password", "reset", "change", "update", "modify", "preference",
-                "setting", "configuration"
-            ]
-        }
-
-        self.category_keywords = {
-            TicketCategory.SYSTEM_DOWN: [
-                "down", "outage", "offline", "unavailable", "not accessible",
-                "server down", "service down", "system down"
-            ],
-            TicketCategory.PERFORMANCE_ISSUE: [
-                "slow", "performance", "lag", "timeout", "response time",
-                "bottleneck", "optimization"
-            ],
-            TicketCategory.PASSWORD_RESET: [
-                "password", "reset", "forgot", "locked", "unlock", "change password"
-            ],
-            TicketCategory.SOFTWARE_INSTALLATION: [
-                "install", "installation", "setup", "configure", "deploy",
-                "software", "application", "program"
-            ],
-            TicketCategory.HARDWARE_ISSUE: [
-                "hardware", "device", "printer", "scanner", "monitor",
-                "keyboard", "mouse", "physical"
-            ],
-            TicketCategory.NETWORK_ISSUE: [
-                "network", "connection", "wifi", "ethernet", "internet",
-                "connectivity", "dns", "ip", "vpn"
-            ]
-        }
+        self.priority_keywords = _PRIORITY_KEYWORDS
+        self.category_keywords = _CATEGORY_KEYWORDS
+
+        # Inverted keyword indexes so each ticket is tokenized once
+        self._priority_index = _PRIORITY_INDEX
+        self._category_index = _CATEGORY_INDEX
 
     def triage_ticket(self, title: str, description: str) -> Dict[str, Any]:
         """
@@ -63,75 +33,42 @@ class TicketTriageService:
         Returns:
             Dict containing priority, category, and confidence score
         """
-        # Combine title and description for analysis
-        content = f"{title} {description}".lower()
-
-        # Determine priority
-        priority = self._determine_priority(content)
-
-        # Determine category
-        category = self._determine_category(content)
+        return dict(_triage_cached(title, description))
 
-        # Calculate confidence score
-        confidence_score = self._calculate_confidence(content, priority, category)
-
-        return {
-            "priority": priority,
-            "category": category,
-            "confidence_score": confidence_score
-        }
-
-    def _determine_priority(self, content: str) -> TicketPriority:
+    @staticmethod
+    def _determine_priority(priority_scores: Dict[TicketPriority, int]) -> TicketPriority:
         """Determine ticket priority based on content analysis."""
-        # Check for critical keywords
-        for keyword in self.priority_keywords[TicketPriority.CRITICAL]:
-            if keyword in content:
-                return TicketPriority.CRITICAL
-
-        # Check for high priority keywords
-        for keyword in self.priority_keywords[TicketPriority.HIGH]:
-            if keyword in content:
-                return TicketPriority.HIGH
-
-        # Check for low priority keywords
-        for keyword in self.priority_keywords[TicketPriority.LOW]:
-            if keyword in content:
-                return TicketPriority.LOW
+        # Check critical, then high, then low priority keywords
+        for priority in (TicketPriority.CRITICAL, TicketPriority.HIGH, TicketPriority.LOW):
+            if priority_scores[priority]:
+                return priority
 
         # Default to medium priority
         return TicketPriority.MEDIUM
 
-    def _determine_category(self, content: str) -> TicketCategory:
+    @staticmethod
+    def _determine_category(category_scores: Dict[TicketCategory, int]) -> TicketCategory:
         """Determine ticket category based on content analysis."""
-        category_scores = {}
-
-        # Score each category based on keyword matches
-        for category, keywords in self.category_keywords.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in content:
-                    score += 1
-            category_scores[category] = score
-
         # Return category with highest score, or OTHER if no matches
-        if category_scores:
-            best_category = max(category_scores, key=category_scores.get)
-            if category_scores[best_category] > 0:
-                return best_category
+        best_category, best_score = argmax(category_scores)
+        if best_score > 0:
+            return best_category
 
         return TicketCategory.OTHER
 
-    def _calculate_confidence(self, content: str, priority: TicketPriority, category: TicketCategory) -> float:
+    @staticmethod
+    def _calculate_confidence(
+        priority_scores: Dict[TicketPriority, int],
+        category_scores: Dict[TicketCategory, int],
+        priority: TicketPriority,
+        category: TicketCategory
+    ) -> float:
         """Calculate confidence score for the triage decision."""
         confidence = 0.5  # Base confidence
 
-        # Increase confidence based on keyword matches
-        priority_keywords = self.priority_keywords.get(priority, [])
-        category_keywords = self.category_keywords.get(category, [])
-
-        # Count keyword matches
-        priority_matches = sum(1 for keyword in priority_keywords if keyword in content)
-        category_matches = sum(1 for keyword in category_keywords if keyword in content)
+        # Distinct keyword matches for the chosen priority and category
+        priority_matches = priority_scores.get(priority, 0)
+        category_matches = category_scores.get(category, 0)
 
         # Calculate confidence based on matches
         if priority_matches > 0:
@@ -143,3 +80,28 @@ class TicketTriageService:
         # Ensure confidence is between 0 and 1
         return min(1.0, max(0.0, confidence))
 
+@lru_cache(maxsize=4096)
+def _triage_cached(title: str, description: str) -> Dict[str, Any]:
+    """Triage result memoized on the ticket text."""
+    # Scan title and description separately rather than concatenating them
+    title_lower = title.lower()
+    description_lower = description.lower()
+
+    # Score every priority and category from a single tokenization
+    priority_scores = _PRIORITY_INDEX.scores(title_lower, description_lower)
+    category_scores = _CATEGORY_INDEX.scores(title_lower, description_lower)
+
+    # Determine priority
+    priority = TicketTriageService._determine_priority(priority_scores)
+
+    # Determine category
+    category = TicketTriageService._determine_category(category_scores)
+
+    # Calculate confidence score
+    confidence_score = TicketTriageService._calculate_confidence(priority_scores, category_scores, priority, category)
+
+    return {
+        "priority": priority,
+        "category": category,
+        "confidence_score": confidence_score
+    }
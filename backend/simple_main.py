@@ -1,179 +1,173 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from contextlib import asynccontextmanager
 import uvicorn
+import asyncio
+import hashlib
+import logging
 import os
-from datetime import datetime
-import random
+from datetime import date, datetime, time
+from time import monotonic, time as wall_time
+import numpy as np
+import httpx
 import openai
+import orjson
+from pydantic import BaseModel, ConfigDict
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 from dotenv import load_dotenv
 
+from services.chat_keywords import ChatCategoryMatcher
+from services.micro_batcher import MicroBatcher
+from services.mock_metrics import HEALTH_HIGH, HEALTH_LOW, now_iso, rng
+from services.semantic_cache import SemanticCache
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Configure OpenAI
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
-async def get_openai_response(message: str) -> str:
-    """Get response from OpenAI API"""
-    try:
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are an AI assistant for an IT Support System. You are helpful, knowledgeable, and professional.
-                    You can answer questions about technology, IT support, programming, science, business, health, travel, and virtually any topic.
-                    Always provide detailed, well-formatted responses with emojis and clear structure. Be conversational but informative.
-                    If it's an IT-related question, provide specific technical guidance. For other topics, be comprehensive and helpful."""
-                },
-                {"role": "user", "content": message}
-            ],
-            max_tokens=1000,
-            temperature=0.7
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        return f"I apologize, but I'm having trouble connecting to my AI service right now. Error: {str(e)}. Please try again later or contact support."
+def create_openai_client() -> openai.AsyncOpenAI:
+    """Pooled HTTP/2 client shared by chat and embedding calls for the app lifetime"""
+    return openai.AsyncOpenAI(
+        api_key=openai.api_key,
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            http2=True
+        ),
+        # Retries are handled by tenacity with jittered backoff below
+        max_retries=0
+    )
 
-app = FastAPI(
-    title="Unified IT Support System",
-    description="A comprehensive IT support platform",
-    version="1.0.0"
+# Cap concurrent upstream calls so 429s are rare to begin with
+openai_semaphore = asyncio.Semaphore(50)
+
+# Transient failures worth retrying; anything else surfaces immediately
+RETRYABLE_OPENAI_ERRORS = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError)
+
+async def embed_message(message: str) -> list:
+    """Embed a chat message for the semantic response cache"""
+    response = await app.state.openai_client.embeddings.create(
+        model="text-embedding-3-small",
+        input=message
+    )
+    return response.data[0].embedding
+
+# Near-duplicate questions are answered from cache instead of calling OpenAI
+response_cache = SemanticCache(
+    embed=embed_message,
+    threshold=0.92,
+    redis_url=os.getenv("REDIS_URL")
 )
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://frontend:3000"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+# Kept constant and first in the message list so OpenAI's automatic prompt
+# caching can reuse the prefix; only the user message varies
+CHAT_SYSTEM_PROMPT = (
+    "You are the AI assistant of an IT Support System. Answer any topic helpfully and "
+    "professionally, with clear structure and emojis. Give specific technical steps for IT questions."
 )
 
-@app.get("/")
-async def root():
-    return {"message": "Unified IT Support System API", "version": "1.0.0"}
+def chat_messages(message: str) -> list:
+    """Build the OpenAI message list for a user chat message"""
+    return [
+        {"role": "system", "content": CHAT_SYSTEM_PROMPT},
+        {"role": "user", "content": message}
+    ]
 
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy", "service": "unified-it-support"}
+@retry(
+    wait=wait_random_exponential(min=1, max=20),
+    stop=stop_after_attempt(5),
+    retry=retry_if_exception_type(RETRYABLE_OPENAI_ERRORS),
+    reraise=True
+)
+async def fetch_openai_response(message: str) -> str:
+    """Call the OpenAI chat API; errors propagate so they are never cached"""
+    async with openai_semaphore:
+        response = await app.state.openai_client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=chat_messages(message),
+            max_tokens=1000,
+            temperature=0.7
+        )
+    return response.choices[0].message.content
 
-@app.get("/api/dashboard/health")
-async def get_system_health():
-    """Get current system health metrics."""
-    return {
-        "cpu_usage": round(random.uniform(20, 80), 1),
-        "memory_usage": round(random.uniform(30, 90), 1),
-        "disk_usage": round(random.uniform(10, 70), 1),
-        "uptime_hours": round(random.uniform(24, 168), 1),
-        "active_alerts": random.randint(0, 5),
-        "open_tickets": random.randint(0, 10)
-    }
+async def stream_openai_response(message: str):
+    """Stream an OpenAI chat completion as server-sent events"""
+    try:
+        async with openai_semaphore:
+            stream = await app.state.openai_client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=chat_messages(message),
+                max_tokens=1000,
+                temperature=0.7,
+                stream=True
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield b"data: " + orjson.dumps({"delta": delta}) + b"\n\n"
+    except Exception as e:
+        error = f"I apologize, but I'm having trouble connecting to my AI service right now. Error: {str(e)}. Please try again later or contact support."
+        yield b"data: " + orjson.dumps({"delta": error}) + b"\n\n"
+    yield b"data: " + orjson.dumps({
+        "done": True,
+        "session_id": f"session_{rng.integers(1000, 10000)}"
+    }) + b"\n\n"
+
+async def fetch_openai_batch(messages: list) -> list:
+    """Send a drained batch of prompts as concurrent requests on the pooled client"""
+    return await asyncio.gather(
+        *(fetch_openai_response(message) for message in messages),
+        return_exceptions=True
+    )
 
-@app.get("/api/dashboard/metrics")
-async def get_dashboard_metrics(hours: int = 24):
-    """Get comprehensive dashboard metrics."""
-    # Generate mock data
-    cpu_history = []
-    memory_history = []
-    disk_history = []
-
-    for i in range(24):
-        timestamp = datetime.now().replace(hour=i, minute=0, second=0, microsecond=0)
-        cpu_history.append({
-            "timestamp": timestamp.isoformat(),
-            "value": round(random.uniform(20, 80), 1)
-        })
-        memory_history.append({
-            "timestamp": timestamp.isoformat(),
-            "value": round(random.uniform(30, 90), 1)
-        })
-        disk_history.append({
-            "timestamp": timestamp.isoformat(),
-            "value": round(random.uniform(10, 70), 1)
-        })
+# Prompts arriving within 20 ms are dispatched together
+chat_batcher = MicroBatcher(fetch_openai_batch, max_batch=16, max_wait=0.02)
 
-    return {
-        "system_health": {
-            "cpu_usage": round(random.uniform(20, 80), 1),
-            "memory_usage": round(random.uniform(30, 90), 1),
-            "disk_usage": round(random.uniform(10, 70), 1),
-            "uptime_hours": round(random.uniform(24, 168), 1),
-            "active_alerts": random.randint(0, 5),
-            "open_tickets": random.randint(0, 10)
-        },
-        "cpu_history": cpu_history,
-        "memory_history": memory_history,
-        "disk_history": disk_history,
-        "recent_alerts": [
-            {
-                "id": 1,
-                "title": "High CPU Usage",
-                "severity": "high",
-                "status": "active",
-                "timestamp": datetime.now().isoformat()
-            }
-        ],
-        "recent_tickets": [
-            {
-                "id": 1,
-                "title": "Server Performance Issue",
-                "priority": "high",
-                "status": "open",
-                "created_at": datetime.now().isoformat()
-            }
-        ]
-    }
+# Identical prompts already in flight share one upstream call
+INFLIGHT: dict = {}
 
-@app.get("/api/tickets")
-async def get_tickets():
-    """Get tickets."""
-    return [
-        {
-            "id": 1,
-            "title": "Server Performance Issue",
-            "description": "The production server is running slowly",
-            "priority": "high",
-            "status": "open",
-            "category": "performance_issue",
-            "created_by": 1,
-            "assigned_to": None,
-            "auto_categorized": True,
-            "confidence_score": 0.85,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "resolved_at": None
-        }
-    ]
+async def fetch_openai_response_once(message: str) -> str:
+    """Coalesce concurrent identical prompts onto a single OpenAI request"""
+    key = hashlib.blake2b(message.encode(), digest_size=16).hexdigest()
+    future = INFLIGHT.get(key)
+    if future is not None:
+        # Shield so a cancelled waiter does not cancel the shared call
+        return await asyncio.shield(future)
 
-@app.post("/api/tickets")
-async def create_ticket(ticket_data: dict):
-    """Create a new ticket."""
-    return {
-        "id": random.randint(100, 999),
-        "title": ticket_data.get("title", "New Ticket"),
-        "description": ticket_data.get("description", ""),
-        "priority": ticket_data.get("priority", "medium"),
-        "status": "open",
-        "category": ticket_data.get("category", "other"),
-        "created_by": 1,
-        "assigned_to": None,
-        "auto_categorized": True,
-        "confidence_score": 0.75,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
-        "resolved_at": None
-    }
+    future = asyncio.get_running_loop().create_future()
+    INFLIGHT[key] = future
+    try:
+        response = await chat_batcher.submit(message)
+        future.set_result(response)
+        return response
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark retrieved so a call with no waiters does not log a warning
+        future.exception()
+        raise
+    finally:
+        INFLIGHT.pop(key, None)
 
-@app.post("/api/chatbot/chat")
-async def chat_with_bot(chat_data: dict):
-    """Chat with the AI-powered universal assistant."""
-    message = chat_data.get("message", "").strip()
-    message_lower = message.lower()
+async def get_openai_response(message: str) -> str:
+    """Get response from OpenAI API"""
+    try:
+        # Cache first, then single-flight, then the API
+        return await response_cache.get_or_compute(message, fetch_openai_response_once)
+    except Exception as e:
+        return f"I apologize, but I'm having trouble connecting to my AI service right now. Error: {str(e)}. Please try again later or contact support."
 
-    # Enhanced universal AI responses with better formatting and unlimited scope
-    if any(word in message_lower for word in ["hi", "hello", "hey", "greetings", "good morning", "good afternoon", "good evening"]):
-        response_text = """👋 **Hello! I'm your AI Assistant**
+# Static chatbot replies: category -> (response text, confidence)
+CHAT_RESPONSES = {
+    "greeting": ("""👋 **Hello! I'm your AI Assistant**
 
 I'm here to help you with virtually anything! I can assist with:
 
@@ -199,11 +193,8 @@ I'm here to help you with virtually anything! I can assist with:
 • Help with problem-solving
 • Offer creative solutions
 
-What would you like to know or discuss today?"""
-        confidence = 0.95
-
-    elif any(word in message_lower for word in ["password", "reset", "forgot", "login", "access", "account"]):
-        response_text = """🔐 **Password & Account Help**
+What would you like to know or discuss today?""", 0.95),
+    "account": ("""🔐 **Password & Account Help**
 
 I can help you with various account and password issues:
 
@@ -228,11 +219,8 @@ I can help you with various account and password issues:
 • Monitor account activity
 • Use secure networks when logging in
 
-**Need specific help?** Let me know your exact situation and I'll provide tailored guidance!"""
-        confidence = 0.95
-
-    elif any(word in message_lower for word in ["vpn", "remote", "connect", "network", "virtual private network"]):
-        response_text = """🌐 **VPN & Network Connectivity**
+**Need specific help?** Let me know your exact situation and I'll provide tailored guidance!""", 0.95),
+    "vpn": ("""🌐 **VPN & Network Connectivity**
 
 I can help you with VPN setup and network issues:
 
@@ -256,11 +244,8 @@ I can help you with VPN setup and network issues:
 • Bypasses geographic restrictions
 • Maintains privacy and anonymity
 
-**Need the VPN client or having specific issues?** I can provide detailed troubleshooting steps!"""
-        confidence = 0.9
-
-    elif any(word in message_lower for word in ["slow", "performance", "lag", "freeze", "hanging", "optimize"]):
-        response_text = """⚡ **Performance Optimization & Troubleshooting**
+**Need the VPN client or having specific issues?** I can provide detailed troubleshooting steps!""", 0.9),
+    "performance": ("""⚡ **Performance Optimization & Troubleshooting**
 
 I can help diagnose and fix performance issues:
 
@@ -290,11 +275,8 @@ I can help diagnose and fix performance issues:
 • Security concerns or malware
 • Complex software conflicts
 
-**Would you like me to create a support ticket for hands-on assistance?**"""
-        confidence = 0.9
-
-    elif any(word in message_lower for word in ["software", "install", "application", "program", "app"]):
-        response_text = """💻 **Software Installation & Management**
+**Would you like me to create a support ticket for hands-on assistance?**""", 0.9),
+    "software": ("""💻 **Software Installation & Management**
 
 I can help with software installation and management:
 
@@ -326,11 +308,8 @@ I can help with software installation and management:
 • Avoid pirated or cracked software
 • Use company-approved software when possible
 
-**Need help with a specific software installation?** Tell me what you're trying to install!"""
-        confidence = 0.9
-
-    elif any(word in message_lower for word in ["hours", "time", "available", "support", "contact"]):
-        response_text = """🕒 **Support Hours & Contact Information**
+**Need help with a specific software installation?** Tell me what you're trying to install!""", 0.9),
+    "support_hours": ("""🕒 **Support Hours & Contact Information**
 
 **⏰ IT Support Availability:**
 • **Regular Hours:** Monday-Friday, 8:00 AM - 6:00 PM
@@ -356,11 +335,8 @@ I can help with software installation and management:
 • **Security Issues:** Report immediately to security team
 • **System Outages:** Check status page for updates
 
-**Need immediate assistance?** I'm here 24/7 to help!"""
-        confidence = 0.95
-
-    elif any(word in message_lower for word in ["cybersecurity", "security", "hack", "malware", "virus", "phishing"]):
-        response_text = """🛡️ **Cybersecurity & Information Security**
+**Need immediate assistance?** I'm here 24/7 to help!""", 0.95),
+    "security": ("""🛡️ **Cybersecurity & Information Security**
 
 I can help you understand and implement cybersecurity best practices:
 
@@ -398,11 +374,8 @@ I can help you understand and implement cybersecurity best practices:
 • **Reporting:** Report suspicious activities immediately
 • **Vigilance:** Stay informed about new threats
 
-**Need specific security guidance?** I can provide detailed information on any security topic!"""
-        confidence = 0.9
-
-    elif any(word in message_lower for word in ["programming", "code", "development", "python", "javascript", "java", "coding"]):
-        response_text = """💻 **Programming & Software Development**
+**Need specific security guidance?** I can provide detailed information on any security topic!""", 0.9),
+    "programming": ("""💻 **Programming & Software Development**
 
 I can help you with programming concepts, code examples, and development best practices:
 
@@ -441,11 +414,8 @@ I can help you with programming concepts, code examples, and development best pr
 • **Practice:** LeetCode, HackerRank, Codewars
 • **Projects:** Build real applications, contribute to open source
 
-**What specific programming topic would you like to explore?** I can provide code examples, explanations, and guidance!"""
-        confidence = 0.9
-
-    elif any(word in message_lower for word in ["science", "physics", "chemistry", "biology", "mathematics", "math"]):
-        response_text = """🔬 **Science & Mathematics**
+**What specific programming topic would you like to explore?** I can provide code examples, explanations, and guidance!""", 0.9),
+    "science": ("""🔬 **Science & Mathematics**
 
 I can help you understand scientific concepts and mathematical principles:
 
@@ -484,11 +454,8 @@ I can help you understand scientific concepts and mathematical principles:
 • **Analysis:** Data interpretation
 • **Conclusion:** Evidence-based results
 
-**What specific scientific or mathematical concept would you like to explore?** I can provide detailed explanations, examples, and problem-solving strategies!"""
-        confidence = 0.9
-
-    elif any(word in message_lower for word in ["business", "finance", "economics", "marketing", "management"]):
-        response_text = """💼 **Business & Finance**
+**What specific scientific or mathematical concept would you like to explore?** I can provide detailed explanations, examples, and problem-solving strategies!""", 0.9),
+    "business": ("""💼 **Business & Finance**
 
 I can help you understand business concepts, financial principles, and management strategies:
 
@@ -527,11 +494,8 @@ I can help you understand business concepts, financial principles, and managemen
 • **Risk Assessment:** Identification, mitigation, monitoring
 • **Decision Making:** Cost-benefit analysis, scenario planning
 
-**What specific business or finance topic interests you?** I can provide detailed insights, frameworks, and practical advice!"""
-        confidence = 0.9
-
-    elif any(word in message_lower for word in ["health", "medical", "wellness", "fitness", "nutrition"]):
-        response_text = """🏥 **Health & Wellness**
+**What specific business or finance topic interests you?** I can provide detailed insights, frameworks, and practical advice!""", 0.9),
+    "health": ("""🏥 **Health & Wellness**
 
 I can provide information on health, wellness, and medical topics:
 
@@ -566,11 +530,8 @@ I can provide information on health, wellness, and medical topics:
 **⚠️ Important Disclaimer:**
 This information is for educational purposes only and should not replace professional medical advice. Always consult with healthcare providers for medical concerns.
 
-**What specific health or wellness topic would you like to explore?** I can provide evidence-based information and general guidance!"""
-        confidence = 0.85
-
-    elif any(word in message_lower for word in ["travel", "trip", "vacation", "destination", "tourism"]):
-        response_text = """✈️ **Travel & Tourism**
+**What specific health or wellness topic would you like to explore?** I can provide evidence-based information and general guidance!""", 0.85),
+    "travel": ("""✈️ **Travel & Tourism**
 
 I can help you plan amazing trips and explore destinations around the world:
 
@@ -606,11 +567,8 @@ I can help you plan amazing trips and explore destinations around the world:
 • **Safety Tips:** Scams, emergency contacts, travel insurance
 • **Cultural Etiquette:** Local customs, dress codes, tipping
 
-**What destination or travel topic interests you?** I can provide detailed travel guides, tips, and recommendations!"""
-        confidence = 0.9
-
-    elif any(word in message_lower for word in ["information", "info", "data", "knowledge", "facts", "details"]):
-        response_text = """📚 **Information & Knowledge**
+**What destination or travel topic interests you?** I can provide detailed travel guides, tips, and recommendations!""", 0.9),
+    "information": ("""📚 **Information & Knowledge**
 
 I can help you understand and find information on virtually any topic!
 
@@ -638,11 +596,11 @@ Information is **data that has been processed, organized, and structured** to pr
 • **Practical Information:** How-to guides, troubleshooting, best practices
 • **Academic Topics:** Research, theories, methodologies
 
-**What specific information are you looking for?** I can provide detailed, accurate, and well-sourced information on any topic!"""
-        confidence = 0.9
+**What specific information are you looking for?** I can provide detailed, accurate, and well-sourced information on any topic!""", 0.9)
+}
 
-    elif any(word in message_lower for word in ["what", "how", "why", "when", "where", "who", "explain", "define", "meaning"]):
-        response_text = f"""🤔 **I'd be happy to help explain that!**
+# Replies that quote the user's message back
+EXPLAIN_RESPONSE_TEMPLATE = """🤔 **I'd be happy to help explain that!**
 
 You asked: **"{message}"**
 
@@ -678,11 +636,9 @@ I can provide detailed explanations on virtually any topic. Here's how I can hel
 - "Why is cybersecurity important?"
 
 I'm here to provide clear, comprehensive explanations!"""
-        confidence = 0.85
+EXPLAIN_CONFIDENCE = 0.85
 
-    else:
-        # Universal response for any topic not specifically covered
-        response_text = f"""🤖 **I'm here to help with anything!**
+UNIVERSAL_RESPONSE_TEMPLATE = """🤖 **I'm here to help with anything!**
 
 I understand you're asking about **"{message}"** - that's a great question!
 
@@ -710,42 +666,336 @@ I understand you're asking about **"{message}"** - that's a great question!
 5. **Answer** follow-up questions
 
 **What would you like to know more about?** Feel free to ask me anything - I'm designed to be helpful, accurate, and comprehensive in my responses!"""
-        confidence = 0.8
+UNIVERSAL_CONFIDENCE = 0.8
+
+chat_matcher = ChatCategoryMatcher()
+
+# Static chat replies serialized once; only session_id/ticket_id vary per call
+CHAT_RESPONSES_JSON = {
+    category: orjson.dumps({
+        "response": text,
+        "confidence_score": confidence,
+        "was_escalated": confidence < 0.6
+    })
+    for category, (text, confidence) in CHAT_RESPONSES.items()
+}
+
+def static_json(payload) -> tuple:
+    """Serialize a constant payload once and return (body, etag)"""
+    body = orjson.dumps(payload)
+    return body, f'"{hashlib.md5(body).hexdigest()}"'
+
+def static_response(request: Request, body: bytes, etag: str) -> Response:
+    """Return a precomputed JSON body, or 304 when the client already has it"""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"etag": etag})
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"etag": etag, "cache-control": "public, max-age=60"}
+    )
+
+class TTLPayload:
+    """Serialize a generated payload at most once per TTL window"""
+
+    def __init__(self, build, ttl: float = 1.0):
+        self._build = build
+        self.ttl = ttl
+        self._body = b""
+        self._expires = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> bytes:
+        if monotonic() < self._expires:
+            return self._body
+        # Only one request regenerates; the rest reuse its result
+        async with self._lock:
+            now = monotonic()
+            if now >= self._expires:
+                self._body = orjson.dumps(self._build())
+                self._expires = now + self.ttl
+        return self._body
+
+STARTED_AT = now_iso()
+
+ROOT_JSON, ROOT_ETAG = static_json({"message": "Unified IT Support System API", "version": "1.0.0"})
+HEALTH_JSON, HEALTH_ETAG = static_json({"status": "healthy", "service": "unified-it-support"})
+TICKETS_JSON, TICKETS_ETAG = static_json([
+    {
+        "id": 1,
+        "title": "Server Performance Issue",
+        "description": "The production server is running slowly",
+        "priority": "high",
+        "status": "open",
+        "category": "performance_issue",
+        "created_by": 1,
+        "assigned_to": None,
+        "auto_categorized": True,
+        "confidence_score": 0.85,
+        "created_at": STARTED_AT,
+        "updated_at": STARTED_AT,
+        "resolved_at": None
+    }
+])
+FAQS_JSON, FAQS_ETAG = static_json([
+    {
+        "id": 1,
+        "question": "How do I reset my password?",
+        "answer": "You can reset your password by clicking 'Forgot Password' on the login page.",
+        "category": "Authentication",
+        "tags": ["password", "reset"],
+        "is_active": True,
+        "created_at": STARTED_AT
+    }
+])
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup; without an API key the chat endpoint answers locally
+    app.state.openai_client = create_openai_client() if openai.api_key else None
+    yield
+    # Shutdown
+    await chat_batcher.close()
+    if app.state.openai_client is not None:
+        await app.state.openai_client.close()
+
+app = FastAPI(
+    title="Unified IT Support System",
+    description="A comprehensive IT support platform",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
+# Chat replies are kilobytes of repetitive Markdown; small bodies skip compression
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
+# CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:3000", "http://frontend:3000"],
+    allow_credentials=True,
+    # Explicit lists plus max_age let browsers cache preflights for a day
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["authorization", "content-type", "if-none-match"],
+    max_age=86400,
+)
+
+# Pydantic models
+class ChatRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    message: str = ""
+    stream: bool = False
+
+class TicketCreate(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    title: str = "New Ticket"
+    description: str = ""
+    priority: str = "medium"
+    category: str = "other"
+
+class LoginRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    # Defaults keep the existing "Username and password required" reply
+    username: str = ""
+    password: str = ""
+
+@app.get("/")
+async def root(request: Request):
+    return static_response(request, ROOT_JSON, ROOT_ETAG)
+
+@app.get("/health")
+async def health_check(request: Request):
+    return static_response(request, HEALTH_JSON, HEALTH_ETAG)
+
+def build_system_health() -> dict:
+    cpu, memory, disk, uptime = rng.uniform(HEALTH_LOW, HEALTH_HIGH).round(1).tolist()
+    active_alerts, open_tickets = rng.integers([0, 0], [6, 11]).tolist()
+    return {
+        "cpu_usage": cpu,
+        "memory_usage": memory,
+        "disk_usage": disk,
+        "uptime_hours": uptime,
+        "active_alerts": active_alerts,
+        "open_tickets": open_tickets
+    }
+
+# Today's hourly timestamps, rebuilt only when the date changes
+_hour_timestamps = (None, [])
+
+def hour_timestamps() -> list:
+    global _hour_timestamps
+    today = date.today()
+    if _hour_timestamps[0] != today:
+        midnight = datetime.combine(today, time())
+        _hour_timestamps = (today, [midnight.replace(hour=i).isoformat() for i in range(24)])
+    return _hour_timestamps[1]
+
+def metric_history(timestamps: list, low: float, high: float) -> list:
+    values = np.round(rng.uniform(low, high, len(timestamps)), 1).tolist()
+    return [{"timestamp": ts, "value": value} for ts, value in zip(timestamps, values)]
+
+def build_dashboard_metrics() -> dict:
+    # Generate mock data: one vectorized draw per series
+    timestamps = hour_timestamps()
+    cpu_history = metric_history(timestamps, 20, 80)
+    memory_history = metric_history(timestamps, 30, 90)
+    disk_history = metric_history(timestamps, 10, 70)
+
+    return {
+        "system_health": build_system_health(),
+        "cpu_history": cpu_history,
+        "memory_history": memory_history,
+        "disk_history": disk_history,
+        "recent_alerts": [
+            {
+                "id": 1,
+                "title": "High CPU Usage",
+                "severity": "high",
+                "status": "active",
+                "timestamp": now_iso()
+            }
+        ],
+        "recent_tickets": [
+            {
+                "id": 1,
+                "title": "Server Performance Issue",
+                "priority": "high",
+                "status": "open",
+                "created_at": now_iso()
+            }
+        ]
+    }
+
+# Dashboards poll these; one payload per second serves every client
+system_health_payload = TTLPayload(build_system_health, ttl=1.0)
+dashboard_metrics_payload = TTLPayload(build_dashboard_metrics, ttl=1.0)
+
+@app.get("/api/dashboard/health")
+async def get_system_health():
+    """Get current system health metrics."""
+    return Response(content=await system_health_payload.get(), media_type="application/json")
+
+@app.get("/api/dashboard/metrics")
+async def get_dashboard_metrics(hours: int = 24):
+    """Get comprehensive dashboard metrics."""
+    return Response(content=await dashboard_metrics_payload.get(), media_type="application/json")
+
+@app.get("/api/tickets")
+async def get_tickets(request: Request):
+    """Get tickets."""
+    return static_response(request, TICKETS_JSON, TICKETS_ETAG)
+
+@app.post("/api/tickets")
+async def create_ticket(ticket_data: TicketCreate):
+    """Create a new ticket."""
+    timestamp = now_iso()
+    return {
+        "id": int(rng.integers(100, 1000)),
+        "title": ticket_data.title,
+        "description": ticket_data.description,
+        "priority": ticket_data.priority,
+        "status": "open",
+        "category": ticket_data.category,
+        "created_by": 1,
+        "assigned_to": None,
+        "auto_categorized": True,
+        "confidence_score": 0.75,
+        "created_at": timestamp,
+        "updated_at": timestamp,
+        "resolved_at": None
+    }
+
+# How often chat requests need the LLM at all
+chat_routing = {"local_hits": 0, "llm_calls": 0}
+
+@app.post("/api/chatbot/chat")
+async def chat_with_bot(chat_data: ChatRequest):
+    """Chat with the AI-powered universal assistant."""
+    message = chat_data.message.strip()
+    message_lower = message.lower()
+
+    # Tier 1: keyword-matched replies are answered locally with no network call.
+    # Tier 2: anything else goes to OpenAI behind the semantic cache.
+    category = chat_matcher.match(message_lower)
+    if category is None:
+        chat_routing["llm_calls"] += 1
+        logger.debug(
+            "Chat routed to OpenAI (%d local / %d llm)",
+            chat_routing["local_hits"], chat_routing["llm_calls"]
+        )
+    else:
+        chat_routing["local_hits"] += 1
+
+    if category is None and chat_data.stream and openai.api_key:
+        # Open-ended questions can stream from OpenAI to cut time-to-first-byte
+        # An explicit encoding keeps GZipMiddleware from buffering the event stream
+        return StreamingResponse(
+            stream_openai_response(message),
+            media_type="text/event-stream",
+            headers={"content-encoding": "identity", "cache-control": "no-cache"}
+        )
+    if category is None and openai.api_key:
+        response_text = await get_openai_response(message)
+        confidence = UNIVERSAL_CONFIDENCE
+    elif category is None:
+        # Universal response when no OpenAI key is configured
+        response_text = UNIVERSAL_RESPONSE_TEMPLATE.format(message=message)
+        confidence = UNIVERSAL_CONFIDENCE
+    elif category == "explain":
+        response_text = EXPLAIN_RESPONSE_TEMPLATE.format(message=message)
+        confidence = EXPLAIN_CONFIDENCE
+    else:
+        # Splice the per-call fields into the pre-serialized reply
+        confidence = CHAT_RESPONSES[category][1]
+        tail = orjson.dumps({
+            "session_id": f"session_{rng.integers(1000, 10000)}",
+            "ticket_id": int(rng.integers(1000, 10000)) if confidence < 0.6 else None
+        })
+        return Response(
+            content=CHAT_RESPONSES_JSON[category][:-1] + b"," + tail[1:],
+            media_type="application/json"
+        )
 
     return {
         "response": response_text,
-        "session_id": f"session_{random.randint(1000, 9999)}",
+        "session_id": f"session_{rng.integers(1000, 10000)}",
         "confidence_score": confidence,
         "was_escalated": confidence < 0.6,
-        "ticket_id": random.randint(1000, 9999) if confidence < 0.6 else None
+        "ticket_id": int(rng.integers(1000, 10000)) if confidence < 0.6 else None
+    }
+
+@app.get("/api/chatbot/cache/stats")
+async def get_chat_cache_stats():
+    """Get semantic response cache hit/miss counters and local/LLM routing counts."""
+    total = chat_routing["local_hits"] + chat_routing["llm_calls"]
+    return {
+        **response_cache.stats(),
+        "routing": {
+            **chat_routing,
+            "local_ratio": round(chat_routing["local_hits"] / total, 3) if total else 0.0
+        }
     }
 
 @app.get("/api/chatbot/faqs")
-async def get_faqs():
+async def get_faqs(request: Request):
     """Get FAQ entries."""
-    return [
-        {
-            "id": 1,
-            "question": "How do I reset my password?",
-            "answer": "You can reset your password by clicking 'Forgot Password' on the login page.",
-            "category": "Authentication",
-            "tags": ["password", "reset"],
-            "is_active": True,
-            "created_at": datetime.now().isoformat()
-        }
-    ]
+    return static_response(request, FAQS_JSON, FAQS_ETAG)
 
 # Authentication endpoints
 @app.post("/api/auth/login")
-async def login(login_data: dict):
+async def login(login_data: LoginRequest):
     """Login endpoint."""
-    username = login_data.get("username", "")
-    password = login_data.get("password", "")
+    username = login_data.username
+    password = login_data.password
 
     # Simple mock authentication - accept any username/password for demo
     if username and password:
         return {
-            "access_token": f"mock_token_{username}_{int(datetime.now().timestamp())}",
+            "access_token": f"mock_token_{username}_{int(wall_time())}",
             "token_type": "bearer"
         }
     else:
@@ -761,7 +1011,7 @@ async def register(user_data: dict):
         "full_name": user_data.get("full_name", ""),
         "role": user_data.get("role", "customer"),
         "is_active": True,
-        "created_at": datetime.now().isoformat()
+        "created_at": now_iso()
     }
 
 @app.get("/api/auth/me")
@@ -774,13 +1024,21 @@ async def get_current_user():
         "full_name": "Demo User",
         "role": "admin",
         "is_active": True,
-        "created_at": datetime.now().isoformat()
+        "created_at": now_iso()
     }
 
 if __name__ == "__main__":
+    debug = os.getenv("DEBUG", "False").lower() == "true"
+    # uvicorn picks uvloop/httptools when installed (uvicorn[standard] skips
+    # uvloop on Windows); reload only supports one worker
     uvicorn.run(
         "simple_main:app",
         host="127.0.0.1",
         port=8001,
-        reload=True
+        reload=debug,
+        workers=1 if debug else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        loop="auto",
+        http="auto",
+        access_log=debug,
+        log_level="info" if debug else "warning"
     )
@@ -1,17 +1,33 @@
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Header
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Header, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 import uvicorn
 import os
 from datetime import datetime, timedelta
 import random
+import numpy as np
 import openai
 from dotenv import load_dotenv
-import json
+import hashlib
+import orjson
+from cachetools import TTLCache
+from anyio import to_thread
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 import asyncio
-from typing import List
+from typing import Dict, List, Optional, Set
 
 # Import MFA endpoints
 from mfa_endpoints import router as mfa_router
+from services.ticket_store import AsyncTicketStore, TicketStore
+from services.redis_ticket_store import RedisTicketStore
+from services.response_formatter import format_response
+from services.mock_metrics import ALERT_POOL_SIZE, now_iso, pool_alerts, rng, sample_health
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # Redis is optional; tickets and broadcasts stay in-process without it
+    redis = None
 
 # Load environment variables
 load_dotenv()
@@ -20,84 +36,122 @@ load_dotenv()
 openai.api_key = os.getenv("OPENAI_API_KEY")
 openai.api_base = "https://openrouter.ai/api/v1"
 
+# Shared client so chat calls reuse the same connection pool and TLS sessions
+_openai_client = None
+
+def get_openai_client() -> openai.AsyncOpenAI:
+    # Created on first use so a missing API key surfaces as a chat error, not an import error
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = openai.AsyncOpenAI(
+            api_key=openai.api_key,
+            base_url=openai.api_base,
+            # Retries are handled by tenacity with exponential backoff below
+            max_retries=0
+        )
+    return _openai_client
+
+# Bound concurrent OpenRouter calls so a burst queues here instead of tripping rate limits
+_openrouter_semaphore = asyncio.Semaphore(10)
+
+# Transient failures worth retrying; anything else surfaces immediately
+_RETRYABLE_OPENROUTER_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError
+)
+
+# With REDIS_URL set, tickets and WebSocket broadcasts are shared by every worker
+_redis_url = os.getenv("REDIS_URL")
+_redis_client = redis.from_url(_redis_url) if _redis_url and redis is not None else None
+
+TICKET_EVENTS_CHANNEL = "ticket_events"
+
 # WebSocket connection manager for real-time updates
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    def __init__(self, redis_client=None, channel: str = TICKET_EVENTS_CHANNEL):
+        self.active_connections: Set[WebSocket] = set()
+        # Each worker keeps its own clients; Redis pub/sub carries events between workers
+        self._redis = redis_client
+        self._channel = channel
+        self._relay: Optional[asyncio.Task] = None
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
     async def broadcast(self, message: str):
-        for connection in self.active_connections:
+        # Send to every client concurrently, then drop the broken connections
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(connection.send_text(message) for connection in connections),
+            return_exceptions=True
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.active_connections.discard(connection)
+
+    async def broadcast_json(self, payload: dict):
+        # Serialize once with orjson; clients parse text frames, so decode once too
+        message = orjson.dumps(payload)
+        if self._redis is not None:
             try:
-                await connection.send_text(message)
-            except:
-                # Remove broken connections
-                self.active_connections.remove(connection)
-
-manager = ConnectionManager()
-
-def format_response(text: str) -> str:
-    """Format the AI response with proper HTML-like formatting for better display"""
-    # Convert markdown-style formatting to HTML-like formatting
-    formatted = text.replace('**', '<strong>').replace('**', '</strong>')
-    formatted = formatted.replace('*', '<em>').replace('*', '</em>')
-
-    # Convert bullet points to proper HTML lists
-    lines = formatted.split('\n')
-    formatted_lines = []
-    in_list = False
-
-    for line in lines:
-        line = line.strip()
-        if line.startswith('• '):
-            if not in_list:
-                formatted_lines.append('<ul>')
-                in_list = True
-            formatted_lines.append(f'<li>{line[2:]}</li>')
-        elif line.startswith('- '):
-            if not in_list:
-                formatted_lines.append('<ul>')
-                in_list = True
-            formatted_lines.append(f'<li>{line[2:]}</li>')
-        elif line.startswith(('1. ', '2. ', '3. ', '4. ', '5. ', '6. ', '7. ', '8. ', '9. ')):
-            if not in_list:
-                formatted_lines.append('<ol>')
-                in_list = True
-            # Extract number and text
-            parts = line.split('. ', 1)
-            if len(parts) == 2:
-                formatted_lines.append(f'<li>{parts[1]}</li>')
-        else:
-            if in_list:
-                formatted_lines.append('</ul>' if '•' in formatted_lines[-2] or '-' in formatted_lines[-2] else '</ol>')
-                in_list = False
-            if line:
-                formatted_lines.append(f'<p>{line}</p>')
+                await self._redis.publish(self._channel, message)
+                return
+            except Exception as e:
+                print(f"Warning: Redis publish failed, broadcasting locally: {e}")
+        await self.broadcast(message.decode())
 
-    if in_list:
-        formatted_lines.append('</ul>')
+    async def _relay_events(self):
+        # Forward every published event to this worker's clients, resubscribing after errors
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self._channel)
+                async for event in pubsub.listen():
+                    await self.broadcast(event["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Warning: Redis event relay failed, resubscribing: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    def use_local(self):
+        """Broadcast to this worker's clients only, without Redis"""
+        self._redis = None
+
+    def start_relay(self):
+        if self._redis is not None and self._relay is None:
+            self._relay = asyncio.create_task(self._relay_events())
+
+    async def stop_relay(self):
+        if self._relay is not None:
+            self._relay.cancel()
+            try:
+                await self._relay
+            except asyncio.CancelledError:
+                pass
+            self._relay = None
 
-    return '\n'.join(formatted_lines)
+manager = ConnectionManager(_redis_client)
 
-async def get_enhanced_response(message: str) -> str:
-    """Get response using OpenRouter with enhanced formatting"""
-    try:
-        client = openai.AsyncOpenAI(
-            api_key=openai.api_key,
-            base_url=openai.api_base
-        )
+# A full 1000-token reply formats in about 1 ms; only longer text is worth a thread hop
+_FORMAT_IN_THREAD_CHARS = 4096
 
-        # Enhanced system prompt for better formatting
-        system_prompt = """You are an AI assistant for an IT Support System. You are helpful, knowledgeable, and professional.
+# Formatted replies keyed by normalized prompt; errors are never cached
+_chat_cache = TTLCache(maxsize=1024, ttl=3600)
+
+# Enhanced system prompt for better formatting
+_SYSTEM_PROMPT = """You are an AI assistant for an IT Support System. You are helpful, knowledgeable, and professional.
         You can answer questions about technology, IT support, programming, science, business, health, travel, and virtually any topic.
 
         IMPORTANT FORMATTING RULES:
@@ -112,220 +166,341 @@ async def get_enhanced_response(message: str) -> str:
         - Always provide actionable advice and next steps
         - Use proper markdown formatting for better readability"""
 
-        response = await client.chat.completions.create(
-            model="openai/gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": message}
-            ],
-            max_tokens=1000,
-            temperature=0.7
-        )
+_SYSTEM_MESSAGE = {"role": "system", "content": _SYSTEM_PROMPT}
 
-        # Format the response
-        formatted_response = format_response(response.choices[0].message.content)
+def _chat_messages(message: str) -> List[dict]:
+    return [_SYSTEM_MESSAGE, {"role": "user", "content": message}]
 
-        return formatted_response
+def _chat_cache_key(message: str) -> bytes:
+    return hashlib.blake2b(message.strip().lower().encode(), digest_size=16).digest()
 
-    except Exception as e:
-        return f"""<div class="error-message">
+async def _format_reply(content: str) -> str:
+    if len(content) > _FORMAT_IN_THREAD_CHARS:
+        return await to_thread.run_sync(format_response, content)
+    return format_response(content)
+
+def _chat_error_html(error: Exception) -> str:
+    return f"""<div class="error-message">
         <p>I apologize, but I'm having trouble connecting to my AI service right now.</p>
-        <p><strong>Error:</strong> {str(e)}</p>
+        <p><strong>Error:</strong> {str(error)}</p>
         <p>Please try again later or contact support.</p>
         </div>"""
 
+@retry(
+    wait=wait_exponential(multiplier=0.5, max=8),
+    stop=stop_after_attempt(3),
+    retry=retry_if_exception_type(_RETRYABLE_OPENROUTER_ERRORS),
+    reraise=True
+)
+async def _create_completion(message: str, stream: bool = False):
+    """Start an OpenRouter chat completion; callers hold _openrouter_semaphore"""
+    return await get_openai_client().chat.completions.create(
+        model="openai/gpt-3.5-turbo",
+        messages=_chat_messages(message),
+        max_tokens=1000,
+        temperature=0.7,
+        stream=stream
+    )
+
+async def get_enhanced_response(message: str) -> str:
+    """Get response using OpenRouter with enhanced formatting"""
+    key = _chat_cache_key(message)
+    cached = _chat_cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        async with _openrouter_semaphore:
+            response = await _create_completion(message)
+
+        # Format the response
+        formatted_response = await _format_reply(response.choices[0].message.content)
+        _chat_cache[key] = formatted_response
+
+        return formatted_response
+
+    except Exception as e:
+        return _chat_error_html(e)
+
+def _sse_event(payload: dict) -> bytes:
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+async def stream_enhanced_response(message: str):
+    """Stream raw reply deltas as server-sent events, then the formatted HTML"""
+    key = _chat_cache_key(message)
+    formatted_response = _chat_cache.get(key)
+    if formatted_response is None:
+        try:
+            parts = []
+            # The slot is held for the whole stream, which is when the upstream call is open
+            async with _openrouter_semaphore:
+                stream = await _create_completion(message, stream=True)
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield _sse_event({"delta": delta})
+            # Formatting needs whole lines and lists, so it runs once the text is complete
+            formatted_response = await _format_reply("".join(parts))
+            _chat_cache[key] = formatted_response
+        except Exception as e:
+            formatted_response = _chat_error_html(e)
+
+    yield _sse_event({
+        "done": True,
+        "response": formatted_response,
+        "session_id": f"session_{random.randint(1000, 9999)}",
+        "ai_engine": "openrouter-enhanced"
+    })
+
 app = FastAPI(
     title="Unified IT Support System",
     description="A comprehensive IT support platform with AI-powered FAQ Chatbot using OpenAI",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://127.0.0.1:3000", "http://frontend:3000"],
+    # A frozenset makes the per-request origin check a hash lookup
+    allow_origins=frozenset({"http://localhost:3000", "http://127.0.0.1:3000", "http://frontend:3000"}),
     allow_credentials=True,
+    # Explicit lists plus max_age let browsers cache preflights for a day
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["*"],
+    allow_headers=["authorization", "content-type"],
+    max_age=86400,
 )
 
+# Compress the text-heavy chat and help replies; small bodies go out as-is
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=6)
+
 # Include MFA router
 app.include_router(mfa_router)
 
+@app.on_event("shutdown")
+async def close_openai_client():
+    if _openai_client is not None:
+        await _openai_client.close()
+
+# Constant payloads serialized once at import
+_ROOT_BYTES = orjson.dumps({"message": "Unified IT Support System API with Enhanced AI Chatbot", "version": "1.0.0"})
+_FAVICON_BYTES = orjson.dumps({"message": "No favicon"})
+_HEALTH_BYTES = orjson.dumps({"status": "healthy", "service": "unified-it-support", "ai_engine": "openrouter-enhanced"})
+
+_FAQS_BYTES = orjson.dumps([
+    {
+        "id": 1,
+        "question": "How do I reset my password?",
+        "answer": "Click 'Forgot Password' on the login page and follow the email instructions.",
+        "category": "Account"
+    },
+    {
+        "id": 2,
+        "question": "How do I connect to VPN?",
+        "answer": "Download the VPN client from the IT portal and use your company credentials.",
+        "category": "Network"
+    },
+    {
+        "id": 3,
+        "question": "What are the support hours?",
+        "answer": "IT support is available Monday-Friday, 8 AM - 6 PM. Emergency support is 24/7.",
+        "category": "General"
+    },
+    {
+        "id": 4,
+        "question": "How does the AI chatbot work?",
+        "answer": "Our AI chatbot uses OpenAI technology with enhanced formatting to provide intelligent, contextual responses to your questions.",
+        "category": "AI Support"
+    }
+])
+
 @app.get("/")
 async def root():
-    return {"message": "Unified IT Support System API with Enhanced AI Chatbot", "version": "1.0.0"}
+    return Response(_ROOT_BYTES, media_type="application/json")
 
 @app.get("/favicon.ico")
 async def favicon():
     """Favicon endpoint to prevent 500 errors."""
-    return {"message": "No favicon"}
+    return Response(_FAVICON_BYTES, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "unified-it-support", "ai_engine": "openrouter-enhanced"}
+    return Response(_HEALTH_BYTES, media_type="application/json")
 
 @app.get("/api/dashboard/health")
 async def get_system_health():
     """Get current system health metrics."""
-    return {
-        "cpu_usage": round(random.uniform(20, 80), 1),
-        "memory_usage": round(random.uniform(30, 90), 1),
-        "disk_usage": round(random.uniform(10, 70), 1),
-        "uptime_hours": round(random.uniform(24, 168), 1),
-        "active_alerts": random.randint(0, 5),
-        "status": "operational",
-        "ai_status": "active"
-    }
+    return {**sample_health(), "ai_status": "active"}
+
+_hour_offsets = [timedelta(hours=23 - i) for i in range(24)]
+
+# Dashboard floats: cpu, memory, disk, uptime, response time, satisfaction
+_METRIC_FLOAT_LOW = np.array([20, 30, 10, 24, 0.5, 4.0])
+_METRIC_FLOAT_HIGH = np.array([80, 90, 70, 168, 2.0, 5.0])
+
+# Dashboard ints (upper bounds exclusive): active alerts, total queries,
+# successful responses, active sessions, total/open/resolved-today tickets,
+# resolution hours, number of alerts to list, alert pool offset
+_METRIC_INT_LOW = np.array([0, 100, 95, 5, 50, 10, 5, 2, 0, 0])
+_METRIC_INT_HIGH = np.array([6, 1001, 101, 51, 201, 51, 26, 49, 6, ALERT_POOL_SIZE])
+
+
+def _metric_history(timestamps: List[str], current: float, spread: float) -> List[dict]:
+    """One vectorized draw of history values within spread of the current value"""
+    values = rng.uniform(max(0, current - spread), min(100, current + spread), len(timestamps)).round(1).tolist()
+    return [{"timestamp": ts, "value": value} for ts, value in zip(timestamps, values)]
 
 @app.get("/api/dashboard/metrics")
 async def get_dashboard_metrics():
     """Get comprehensive dashboard metrics."""
-    # Generate current values
-    current_cpu = round(random.uniform(20, 80), 1)
-    current_memory = round(random.uniform(30, 90), 1)
-    current_disk = round(random.uniform(10, 70), 1)
+    # Generate current values, one draw for every float and one for every int
+    (current_cpu, current_memory, current_disk, uptime,
+     response_time, satisfaction) = rng.uniform(_METRIC_FLOAT_LOW, _METRIC_FLOAT_HIGH).round(1).tolist()
+    (active_alerts, total_queries, successful_responses, active_sessions, tickets_total,
+     tickets_open, resolved_today, resolution_hours, alert_count,
+     alert_start) = rng.integers(_METRIC_INT_LOW, _METRIC_INT_HIGH).tolist()
 
     # Generate historical data for the last 24 hours (24 data points)
     now = datetime.now()
-    cpu_history = []
-    memory_history = []
-    disk_history = []
-
-    for i in range(24):
-        timestamp = now - timedelta(hours=23-i)
-        cpu_history.append({
-            "timestamp": timestamp.isoformat(),
-            "value": round(random.uniform(max(0, current_cpu - 20), min(100, current_cpu + 20)), 1)
-        })
-        memory_history.append({
-            "timestamp": timestamp.isoformat(),
-            "value": round(random.uniform(max(0, current_memory - 15), min(100, current_memory + 15)), 1)
-        })
-        disk_history.append({
-            "timestamp": timestamp.isoformat(),
-            "value": round(random.uniform(max(0, current_disk - 10), min(100, current_disk + 10)), 1)
-        })
+    timestamps = [(now - offset).isoformat() for offset in _hour_offsets]
+    alert_time = now.isoformat()
+    cpu_history = _metric_history(timestamps, current_cpu, 20)
+    memory_history = _metric_history(timestamps, current_memory, 15)
+    disk_history = _metric_history(timestamps, current_disk, 10)
 
     return {
         "system_health": {
             "cpu_usage": current_cpu,
             "memory_usage": current_memory,
             "disk_usage": current_disk,
-            "uptime_hours": round(random.uniform(24, 168), 1),
-            "active_alerts": random.randint(0, 5),
+            "uptime_hours": uptime,
+            "active_alerts": active_alerts,
             "status": "operational"
         },
         "cpu_history": cpu_history,
         "memory_history": memory_history,
         "disk_history": disk_history,
         "ai_chatbot": {
-            "total_queries": random.randint(100, 1000),
-            "successful_responses": random.randint(95, 100),
-            "avg_response_time": f"{random.uniform(0.5, 2.0):.1f}s",
-            "active_sessions": random.randint(5, 50),
-            "satisfaction_score": round(random.uniform(4.0, 5.0), 1)
+            "total_queries": total_queries,
+            "successful_responses": successful_responses,
+            "avg_response_time": f"{response_time:.1f}s",
+            "active_sessions": active_sessions,
+            "satisfaction_score": satisfaction
         },
         "tickets": {
-            "total": random.randint(50, 200),
-            "open": random.randint(10, 50),
-            "resolved_today": random.randint(5, 25),
-            "avg_resolution_time": f"{random.randint(2, 48)} hours"
+            "total": tickets_total,
+            "open": tickets_open,
+            "resolved_today": resolved_today,
+            "avg_resolution_time": f"{resolution_hours} hours"
         },
-        "alerts": [
-            {
-                "id": random.randint(1000, 9999),
-                "type": random.choice(["warning", "error", "info"]),
-                "message": random.choice([
-                    "High CPU usage detected",
-                    "Memory usage above threshold",
-                    "Disk space running low",
-                    "Network connectivity issue",
-                    "Service restart required"
-                ]),
-                "timestamp": datetime.now().isoformat(),
-                "severity": random.choice(["low", "medium", "high", "critical"])
-            }
-            for _ in range(random.randint(0, 5))
-        ]
+        "alerts": pool_alerts(alert_count, alert_start, alert_time)
     }
 
+# Sample log vocabulary, built once rather than per request
+_LOG_LEVELS = ("INFO", "WARN", "ERROR", "DEBUG", "FATAL")
+_LOG_SOURCES = ("auth", "api", "database", "system", "chatbot", "tickets")
+_LOG_MESSAGES = (
+    "User authentication successful",
+    "API request processed",
+    "Database connection established",
+    "System health check completed",
+    "Chatbot response generated",
+    "Ticket created successfully",
+    "User logged out",
+    "Database query executed",
+    "System backup started",
+    "Error handling triggered",
+    "Cache cleared",
+    "Configuration updated",
+    "Service started",
+    "Service stopped",
+    "Memory usage high",
+    "CPU usage spike detected",
+    "Network connection lost",
+    "File upload completed",
+    "Email sent successfully",
+    "Scheduled task executed"
+)
+_LOG_MESSAGES_LOWER = tuple(message.lower() for message in _LOG_MESSAGES)
+_USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"
+)
+
+# Log generation costs about 4 us per row; larger pages are built on a worker
+# thread so a big limit cannot stall the event loop
+_LOGS_IN_THREAD_MIN = 500
+
 @app.get("/api/dashboard/logs")
 async def get_system_logs(limit: int = 50, level: str = None, search: str = None):
     """Get system logs with optional filtering."""
-    # Generate sample log entries
-    log_levels = ["INFO", "WARN", "ERROR", "DEBUG", "FATAL"]
-    log_sources = ["auth", "api", "database", "system", "chatbot", "tickets"]
-    log_messages = [
-        "User authentication successful",
-        "API request processed",
-        "Database connection established",
-        "System health check completed",
-        "Chatbot response generated",
-        "Ticket created successfully",
-        "User logged out",
-        "Database query executed",
-        "System backup started",
-        "Error handling triggered",
-        "Cache cleared",
-        "Configuration updated",
-        "Service started",
-        "Service stopped",
-        "Memory usage high",
-        "CPU usage spike detected",
-        "Network connection lost",
-        "File upload completed",
-        "Email sent successfully",
-        "Scheduled task executed"
-    ]
+    if limit > _LOGS_IN_THREAD_MIN:
+        return await to_thread.run_sync(_generate_logs, limit, level, search)
+    return _generate_logs(limit, level, search)
+
+def _generate_logs(limit: int, level: Optional[str], search: Optional[str]) -> dict:
+    # Narrow the level/message pools to the filters, then sample only matches
+    levels_pool = [i for i, l in enumerate(_LOG_LEVELS) if not level or level.upper() == l]
+    search_lower = search.lower() if search else None
+    messages_pool = [i for i, m in enumerate(_LOG_MESSAGES_LOWER) if not search_lower or search_lower in m]
+    if limit <= 0 or not levels_pool or not messages_pool:
+        return {"logs": [], "total": 0, "levels": _LOG_LEVELS, "sources": _LOG_SOURCES}
+
+    # Draw every column for all rows in one vectorized pass per column
+    now = datetime.now()
+    level_idx = np.asarray(levels_pool)[rng.integers(0, len(levels_pool), limit)]
+    source_idx = rng.integers(0, len(_LOG_SOURCES), limit)
+    message_idx = np.asarray(messages_pool)[rng.integers(0, len(messages_pool), limit)]
+
+    ids = rng.integers(10000, 100000, limit)
+    minute_offsets = rng.integers(0, 1441, limit)
+    hosts = rng.integers(1, 6, limit)
+    user_ids = np.where(rng.random(limit) < 0.5, rng.integers(1, 101, limit), 0)
+    request_ids = rng.integers(1000, 10000, limit)
+    durations = rng.integers(10, 5001, limit)
+    error_codes = rng.integers(400, 600, limit)
+    ip_suffixes = rng.integers(1, 255, limit)
+    agent_idx = rng.integers(0, len(_USER_AGENTS), limit)
+
+    # Newest first is the smallest minute offset; sort ints, not ISO strings
+    rows = np.argsort(minute_offsets, kind="stable")
+    columns = (
+        level_idx, source_idx, message_idx, ids, minute_offsets, hosts,
+        user_ids, request_ids, durations, error_codes, ip_suffixes, agent_idx
+    )
 
     logs = []
-    for i in range(limit):
-        log_level = random.choice(log_levels)
-        log_source = random.choice(log_sources)
-        log_message = random.choice(log_messages)
-
-        # Apply level filter
-        if level and level.upper() != log_level:
-            continue
-
-        # Apply search filter
-        if search and search.lower() not in log_message.lower():
-            continue
-
+    for (lvl, src, msg, log_id, minutes, host, user_id, request_id,
+         duration, error_code, ip_suffix, agent) in zip(*(column[rows].tolist() for column in columns)):
+        log_level = _LOG_LEVELS[lvl]
         logs.append({
-            "id": random.randint(10000, 99999),
-            "timestamp": (datetime.now() - timedelta(minutes=random.randint(0, 1440))).isoformat(),
+            "id": log_id,
+            "timestamp": (now - timedelta(minutes=minutes)).isoformat(),
             "level": log_level,
-            "source": log_source,
-            "message": log_message,
-            "hostname": f"server-{random.randint(1, 5)}",
-            "metadata": json.dumps({
-                "user_id": random.randint(1, 100) if random.choice([True, False]) else None,
-                "request_id": f"req_{random.randint(1000, 9999)}",
-                "duration_ms": random.randint(10, 5000) if log_level in ["INFO", "DEBUG"] else None,
-                "error_code": random.randint(400, 599) if log_level in ["ERROR", "FATAL"] else None,
-                "ip_address": f"192.168.1.{random.randint(1, 254)}",
-                "user_agent": random.choice([
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-                    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"
-                ])
-            })
+            "source": _LOG_SOURCES[src],
+            "message": _LOG_MESSAGES[msg],
+            "hostname": f"server-{host}",
+            "metadata": orjson.dumps({
+                "user_id": user_id or None,
+                "request_id": f"req_{request_id}",
+                "duration_ms": duration if log_level in ("INFO", "DEBUG") else None,
+                "error_code": error_code if log_level in ("ERROR", "FATAL") else None,
+                "ip_address": f"192.168.1.{ip_suffix}",
+                "user_agent": _USER_AGENTS[agent]
+            }).decode()
         })
 
-    # Sort by timestamp (newest first)
-    logs.sort(key=lambda x: x["timestamp"], reverse=True)
-
     return {
-        "logs": logs[:limit],
+        "logs": logs,
         "total": len(logs),
-        "levels": log_levels,
-        "sources": log_sources
+        "levels": _LOG_LEVELS,
+        "sources": _LOG_SOURCES
     }
 
-# In-memory storage for tickets (in production, use a database)
-tickets_db = [
+# Seed tickets, loaded into the store on startup
+_SEED_TICKETS = [
     {
         "id": 1,
         "title": "Password Reset Request",
@@ -398,6 +573,39 @@ tickets_db = [
     }
 ]
 
+# With Redis every worker shares one ticket store; otherwise (or if Redis is
+# unreachable at startup) tickets live in this process and only a single
+# worker should be run
+if _redis_client is not None:
+    tickets_db = RedisTicketStore(_redis_client)
+else:
+    tickets_db = AsyncTicketStore(TicketStore(_SEED_TICKETS))
+
+@app.on_event("startup")
+async def start_shared_state():
+    global tickets_db
+    try:
+        await tickets_db.seed(_SEED_TICKETS)
+    except Exception as e:
+        if not isinstance(tickets_db, RedisTicketStore):
+            raise
+        # Redis is opt-in; an unreachable server degrades to one in-process worker
+        print(f"Warning: Redis unavailable, keeping tickets and broadcasts in-process: {e}")
+        await tickets_db.close()
+        manager.use_local()
+        tickets_db = AsyncTicketStore(TicketStore(_SEED_TICKETS))
+    manager.start_relay()
+
+@app.on_event("shutdown")
+async def close_shared_state():
+    # Stop the relay before the store closes the Redis client they share
+    await manager.stop_relay()
+    await tickets_db.close()
+
+def _ticket_json(payload) -> Response:
+    # Ticket rows are plain JSON types, so skip FastAPI's recursive jsonable_encoder pass
+    return Response(orjson.dumps(payload), media_type="application/json")
+
 @app.get("/api/tickets")
 async def get_tickets(
     status: str = None,
@@ -407,14 +615,11 @@ async def get_tickets(
     offset: int = 0
 ):
     """Get all tickets with optional filtering."""
-    filtered_tickets = tickets_db.copy()
-
-    # Apply filters
-    if status and status != "all":
-        filtered_tickets = [t for t in filtered_tickets if t["status"] == status]
-
-    if priority and priority != "all":
-        filtered_tickets = [t for t in filtered_tickets if t["priority"] == priority]
+    # Apply filters through the status/priority indexes
+    filtered_tickets = await tickets_db.filter(
+        status=status if status and status != "all" else None,
+        priority=priority if priority and priority != "all" else None
+    )
 
     if search:
         search_lower = search.lower()
@@ -430,21 +635,21 @@ async def get_tickets(
     paginated_tickets = filtered_tickets[offset:offset + limit]
 
     # Return just the tickets array for frontend compatibility
-    return paginated_tickets
+    return _ticket_json(paginated_tickets)
 
 @app.get("/api/tickets/{ticket_id}")
 async def get_ticket(ticket_id: int):
     """Get a specific ticket by ID."""
-    ticket = next((t for t in tickets_db if t["id"] == ticket_id), None)
+    ticket = await tickets_db.get(ticket_id)
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
-    return ticket
+    return _ticket_json(ticket)
 
 @app.post("/api/tickets")
 async def create_ticket(ticket_data: dict):
     """Create a new support ticket."""
     new_ticket = {
-        "id": max([t["id"] for t in tickets_db], default=0) + 1,
+        "id": await tickets_db.next_id(),
         "title": ticket_data.get("title", "New Ticket"),
         "description": ticket_data.get("description", ""),
         "priority": ticket_data.get("priority", "medium"),
@@ -452,66 +657,63 @@ async def create_ticket(ticket_data: dict):
         "category": ticket_data.get("category", "General"),
         "assigned_to": "Unassigned",
         "created_by": ticket_data.get("created_by", "user@example.com"),
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
+        "created_at": now_iso(),
+        "updated_at": now_iso(),
         "resolved_at": None,
         "tags": ticket_data.get("tags", [])
     }
 
-    tickets_db.append(new_ticket)
+    await tickets_db.add(new_ticket)
 
     # Broadcast real-time update
-    await manager.broadcast(json.dumps({
+    await manager.broadcast_json({
         "type": "ticket_created",
         "ticket": new_ticket
-    }))
+    })
 
-    return new_ticket
+    return _ticket_json(new_ticket)
 
 @app.put("/api/tickets/{ticket_id}")
 async def update_ticket(ticket_id: int, ticket_data: dict):
     """Update an existing ticket."""
-    ticket = next((t for t in tickets_db if t["id"] == ticket_id), None)
+    ticket = await tickets_db.get(ticket_id)
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
 
     # Update allowed fields
     updatable_fields = ["title", "description", "priority", "status", "category", "assigned_to", "tags"]
-    for field in updatable_fields:
-        if field in ticket_data:
-            ticket[field] = ticket_data[field]
+    changes = {field: ticket_data[field] for field in updatable_fields if field in ticket_data}
+    changes["updated_at"] = now_iso()
 
-    ticket["updated_at"] = datetime.now().isoformat()
+    # Set resolved_at if status is resolved; the store re-times the resolution
+    status = changes.get("status", ticket["status"])
+    if status == "resolved" and not ticket["resolved_at"]:
+        changes["resolved_at"] = changes["updated_at"]
+    elif status != "resolved":
+        changes["resolved_at"] = None
 
-    # Set resolved_at if status is resolved
-    if ticket["status"] == "resolved" and not ticket["resolved_at"]:
-        ticket["resolved_at"] = datetime.now().isoformat()
-    elif ticket["status"] != "resolved":
-        ticket["resolved_at"] = None
+    ticket = await tickets_db.update(ticket_id, changes)
 
     # Broadcast real-time update
-    await manager.broadcast(json.dumps({
+    await manager.broadcast_json({
         "type": "ticket_updated",
         "ticket": ticket
-    }))
+    })
 
-    return ticket
+    return _ticket_json(ticket)
 
 @app.delete("/api/tickets/{ticket_id}")
 async def delete_ticket(ticket_id: int):
     """Delete a ticket."""
-    global tickets_db
-    ticket = next((t for t in tickets_db if t["id"] == ticket_id), None)
+    ticket = await tickets_db.delete(ticket_id)
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
 
-    tickets_db = [t for t in tickets_db if t["id"] != ticket_id]
-
     # Broadcast real-time update
-    await manager.broadcast(json.dumps({
+    await manager.broadcast_json({
         "type": "ticket_deleted",
         "ticket_id": ticket_id
-    }))
+    })
 
     return {"message": "Ticket deleted successfully"}
 
@@ -521,72 +723,48 @@ async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
     try:
         while True:
-            # Keep connection alive and handle incoming messages
-            data = await websocket.receive_text()
-            # Echo back for testing
-            await manager.send_personal_message(f"Echo: {data}", websocket)
+            # Raw receive takes text and binary frames alike; dead peers are
+            # caught by uvicorn's protocol-level pings (see ws_ping_* below)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            # Echo back for testing, in the frame type it arrived in
+            if message.get("bytes") is not None:
+                await websocket.send_bytes(b"Echo: " + message["bytes"])
+            else:
+                await manager.send_personal_message(f"Echo: {message.get('text', '')}", websocket)
     except WebSocketDisconnect:
+        pass
+    finally:
+        # Any exit, not just a clean disconnect, must drop the client from broadcasts
         manager.disconnect(websocket)
 
-@app.get("/api/tickets/analytics")
-async def get_ticket_analytics():
-    """Get ticket analytics and statistics."""
-    total_tickets = len(tickets_db)
-    open_tickets = len([t for t in tickets_db if t["status"] == "open"])
-    in_progress_tickets = len([t for t in tickets_db if t["status"] == "in_progress"])
-    resolved_tickets = len([t for t in tickets_db if t["status"] == "resolved"])
+# Analytics payload and the store version it was built from
+_analytics_cache = {"version": None, "payload": None}
+
+async def _compute_analytics() -> dict:
+    """Ticket analytics, rebuilt only when the store version has moved"""
+    version = await tickets_db.version()
+    if _analytics_cache["version"] == version:
+        return _analytics_cache["payload"]
+
+    total_tickets = await tickets_db.size()
+    open_tickets = await tickets_db.count("status", "open")
+    in_progress_tickets = await tickets_db.count("status", "in_progress")
+    resolved_tickets = await tickets_db.count("status", "resolved")
 
     priority_breakdown = {
-        "high": len([t for t in tickets_db if t["priority"] == "high"]),
-        "medium": len([t for t in tickets_db if t["priority"] == "medium"]),
-        "low": len([t for t in tickets_db if t["priority"] == "low"])
+        "high": await tickets_db.count("priority", "high"),
+        "medium": await tickets_db.count("priority", "medium"),
+        "low": await tickets_db.count("priority", "low")
     }
 
-    category_breakdown = {}
-    for ticket in tickets_db:
-        category = ticket["category"]
-        category_breakdown[category] = category_breakdown.get(category, 0) + 1
-
-    # Calculate average resolution time
-    resolved_with_times = [t for t in tickets_db if t["resolved_at"]]
-    avg_resolution_hours = 0
-    if resolved_with_times:
-        total_hours = 0
-        valid_tickets = 0
-        for ticket in resolved_with_times:
-            try:
-                # Handle both timezone-aware and naive datetime strings
-                created_str = ticket["created_at"]
-                resolved_str = ticket["resolved_at"]
-
-                # Parse created time
-                if created_str.endswith("Z"):
-                    created = datetime.fromisoformat(created_str.replace("Z", "+00:00"))
-                else:
-                    created = datetime.fromisoformat(created_str)
-
-                # Parse resolved time
-                if resolved_str.endswith("Z"):
-                    resolved = datetime.fromisoformat(resolved_str.replace("Z", "+00:00"))
-                else:
-                    resolved = datetime.fromisoformat(resolved_str)
-
-                # Make both timezone-aware for comparison
-                if created.tzinfo is None:
-                    created = created.replace(tzinfo=None)
-                if resolved.tzinfo is None:
-                    resolved = resolved.replace(tzinfo=None)
-
-                hours = (resolved - created).total_seconds() / 3600
-                total_hours += hours
-                valid_tickets += 1
-            except Exception as e:
-                # Skip tickets with invalid datetime formats
-                print(f"Warning: Skipping ticket {ticket['id']} due to datetime error: {e}")
-                continue
-        avg_resolution_hours = total_hours / valid_tickets if valid_tickets > 0 else 0
+    category_breakdown = await tickets_db.counts("category")
 
-    return {
+    # Average resolution time is maintained incrementally by the store
+    avg_resolution_hours = await tickets_db.avg_resolution_hours()
+
+    payload = {
         "total_tickets": total_tickets,
         "open_tickets": open_tickets,
         "in_progress_tickets": in_progress_tickets,
@@ -596,75 +774,19 @@ async def get_ticket_analytics():
         "avg_resolution_hours": round(avg_resolution_hours, 1),
         "resolution_rate": round((resolved_tickets / total_tickets * 100) if total_tickets > 0 else 0, 1)
     }
+    _analytics_cache["version"] = version
+    _analytics_cache["payload"] = payload
+    return payload
+
+@app.get("/api/tickets/analytics")
+async def get_ticket_analytics():
+    """Get ticket analytics and statistics."""
+    return await _compute_analytics()
 
 @app.get("/api/tickets/analytics/summary")
 async def get_ticket_analytics_summary():
     """Get ticket analytics summary for the frontend."""
-    total_tickets = len(tickets_db)
-    open_tickets = len([t for t in tickets_db if t["status"] == "open"])
-    in_progress_tickets = len([t for t in tickets_db if t["status"] == "in_progress"])
-    resolved_tickets = len([t for t in tickets_db if t["status"] == "resolved"])
-
-    priority_breakdown = {
-        "high": len([t for t in tickets_db if t["priority"] == "high"]),
-        "medium": len([t for t in tickets_db if t["priority"] == "medium"]),
-        "low": len([t for t in tickets_db if t["priority"] == "low"])
-    }
-
-    category_breakdown = {}
-    for ticket in tickets_db:
-        category = ticket["category"]
-        category_breakdown[category] = category_breakdown.get(category, 0) + 1
-
-    # Calculate average resolution time
-    resolved_with_times = [t for t in tickets_db if t["resolved_at"]]
-    avg_resolution_hours = 0
-    if resolved_with_times:
-        total_hours = 0
-        valid_tickets = 0
-        for ticket in resolved_with_times:
-            try:
-                # Handle both timezone-aware and naive datetime strings
-                created_str = ticket["created_at"]
-                resolved_str = ticket["resolved_at"]
-
-                # Parse created time
-                if created_str.endswith("Z"):
-                    created = datetime.fromisoformat(created_str.replace("Z", "+00:00"))
-                else:
-                    created = datetime.fromisoformat(created_str)
-
-                # Parse resolved time
-                if resolved_str.endswith("Z"):
-                    resolved = datetime.fromisoformat(resolved_str.replace("Z", "+00:00"))
-                else:
-                    resolved = datetime.fromisoformat(resolved_str)
-
-                # Make both timezone-aware for comparison
-                if created.tzinfo is None:
-                    created = created.replace(tzinfo=None)
-                if resolved.tzinfo is None:
-                    resolved = resolved.replace(tzinfo=None)
-
-                hours = (resolved - created).total_seconds() / 3600
-                total_hours += hours
-                valid_tickets += 1
-            except Exception as e:
-                # Skip tickets with invalid datetime formats
-                print(f"Warning: Skipping ticket {ticket['id']} due to datetime error: {e}")
-                continue
-        avg_resolution_hours = total_hours / valid_tickets if valid_tickets > 0 else 0
-
-    return {
-        "total_tickets": total_tickets,
-        "open_tickets": open_tickets,
-        "in_progress_tickets": in_progress_tickets,
-        "resolved_tickets": resolved_tickets,
-        "priority_breakdown": priority_breakdown,
-        "category_breakdown": category_breakdown,
-        "avg_resolution_hours": round(avg_resolution_hours, 1),
-        "resolution_rate": round((resolved_tickets / total_tickets * 100) if total_tickets > 0 else 0, 1)
-    }
+    return await _compute_analytics()
 
 @app.post("/api/chatbot/chat")
 async def chat_with_bot(chat_data: dict):
@@ -681,6 +803,15 @@ async def chat_with_bot(chat_data: dict):
             "ai_engine": "openrouter-enhanced"
         }
 
+    if chat_data.get("stream"):
+        # Opt-in streaming: tokens arrive as they are generated instead of after the full reply
+        return StreamingResponse(
+            stream_enhanced_response(message),
+            media_type="text/event-stream",
+            # GZip skips bodies with an encoding set, so events are not held in the compressor
+            headers={"cache-control": "no-cache", "content-encoding": "identity"}
+        )
+
     # Get response from enhanced OpenRouter
     response_text = await get_enhanced_response(message)
 
@@ -699,32 +830,7 @@ async def chat_with_bot(chat_data: dict):
 @app.get("/api/chatbot/faqs")
 async def get_faqs():
     """Get FAQ entries."""
-    return [
-        {
-            "id": 1,
-            "question": "How do I reset my password?",
-            "answer": "Click 'Forgot Password' on the login page and follow the email instructions.",
-            "category": "Account"
-        },
-        {
-            "id": 2,
-            "question": "How do I connect to VPN?",
-            "answer": "Download the VPN client from the IT portal and use your company credentials.",
-            "category": "Network"
-        },
-        {
-            "id": 3,
-            "question": "What are the support hours?",
-            "answer": "IT support is available Monday-Friday, 8 AM - 6 PM. Emergency support is 24/7.",
-            "category": "General"
-        },
-        {
-            "id": 4,
-            "question": "How does the AI chatbot work?",
-            "answer": "Our AI chatbot uses OpenAI technology with enhanced formatting to provide intelligent, contextual responses to your questions.",
-            "category": "AI Support"
-        }
-    ]
+    return Response(_FAQS_BYTES, media_type="application/json")
 
 @app.get("/api/chatbot/analytics")
 async def get_chatbot_analytics():
@@ -747,6 +853,35 @@ async def get_chatbot_analytics():
         "uptime": "99.9%"
     }
 
+# In-memory users keyed by id, with token and username indexes over the same
+# rows; every access is an exact-key lookup, so no path scans the users
+users_by_id: Dict[int, dict] = {}
+users_by_token: Dict[str, dict] = {}
+users_by_username: Dict[str, dict] = {}
+
+def _add_user(user: dict):
+    users_by_id[user["id"]] = user
+    users_by_token[user["token"]] = user
+    # Logins resolve to the first account registered under a username
+    users_by_username.setdefault(user["username"], user)
+
+_BEARER_PREFIX = "Bearer "
+_MIN_TOKEN_LENGTH = 10
+
+def bearer_token(authorization: str = Header(None)) -> str:
+    """Token from a well-formed bearer header, rejecting the rest before the route runs"""
+    if not authorization or not authorization.startswith(_BEARER_PREFIX):
+        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
+
+    # Slice off the prefix rather than split, which allocates a list per request
+    token = authorization[len(_BEARER_PREFIX):]
+
+    # Simple token validation - in production, use proper JWT validation
+    # For now, we'll check if it's a valid token format
+    if len(token) < _MIN_TOKEN_LENGTH:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return token
+
 # Authentication endpoints
 @app.post("/api/auth/login")
 async def login(login_data: dict):
@@ -760,28 +895,26 @@ async def login(login_data: dict):
         token = f"mock_token_{username}_{int(datetime.now().timestamp())}"
 
         # Find or create user
-        user = None
-        for u in users_db:
-            if u["username"] == username:
-                user = u
-                break
+        user = users_by_username.get(username)
 
         if not user:
             # Create new user if not found
             user = {
-                "id": len(users_db) + 1,
+                "id": len(users_by_id) + 1,
                 "username": username,
                 "email": f"{username}@example.com",
                 "full_name": username.title(),
                 "role": "customer",
                 "is_active": True,
-                "created_at": datetime.now().isoformat(),
+                "created_at": now_iso(),
                 "token": token
             }
-            users_db.append(user)
+            _add_user(user)
         else:
-            # Update existing user with new token
+            # Update existing user with new token, retiring the old one
+            users_by_token.pop(user["token"], None)
             user["token"] = token
+            users_by_token[token] = user
 
         return {
             "access_token": token,
@@ -807,18 +940,18 @@ async def register(user_data: dict):
 
     # Create new user
     user = {
-        "id": len(users_db) + 1,
+        "id": len(users_by_id) + 1,
         "username": user_data.get("username", ""),
         "email": user_data.get("email", ""),
         "full_name": user_data.get("full_name", ""),
         "role": user_data.get("role", "customer"),
         "is_active": True,
-        "created_at": datetime.now().isoformat(),
+        "created_at": now_iso(),
         "token": token
     }
 
     # Add to users database
-    users_db.append(user)
+    _add_user(user)
 
     return {
         "id": user["id"],
@@ -833,25 +966,11 @@ async def register(user_data: dict):
     }
 
 @app.get("/api/auth/me")
-async def get_current_user(authorization: str = Header(None)):
+async def get_current_user(token: str = Depends(bearer_token)):
     """Get current user info from token."""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.split(" ")[1]
-
-    # Simple token validation - in production, use proper JWT validation
-    # For now, we'll check if it's a valid token format
-    if not token or len(token) < 10:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
     # Try to find user by token in our simple storage
     # This is a simplified approach - in production, use proper JWT validation
-    user = None
-    for u in users_db:
-        if u.get("token") == token:
-            user = u
-            break
+    user = users_by_token.get(token)
 
     if not user:
         # Fallback: return a default user if token validation fails
@@ -864,7 +983,7 @@ async def get_current_user(authorization: str = Header(None)):
             "full_name": "Demo User",
             "role": "admin",
             "is_active": True,
-            "created_at": datetime.now().isoformat()
+            "created_at": now_iso()
         }
 
     return {
@@ -878,33 +997,40 @@ async def get_current_user(authorization: str = Header(None)):
     }
 
 # Analytics endpoints
+_ANALYTICS_CATEGORIES = ("Hardware", "Software", "Network", "General")
+
 @app.get("/api/analytics/tickets")
 async def get_ticket_analytics():
     """Get ticket analytics for the frontend."""
+    # Read the pre-aggregated counts; the store is only queried after a mutation
+    analytics = await _compute_analytics()
+    categories = analytics["category_breakdown"]
     return {
-        "total_tickets": len(tickets_db),
-        "open_tickets": len([t for t in tickets_db if t["status"] == "open"]),
-        "in_progress_tickets": len([t for t in tickets_db if t["status"] == "in_progress"]),
-        "resolved_tickets": len([t for t in tickets_db if t["status"] == "resolved"]),
-        "priority_breakdown": {
-            "high": len([t for t in tickets_db if t["priority"] == "high"]),
-            "medium": len([t for t in tickets_db if t["priority"] == "medium"]),
-            "low": len([t for t in tickets_db if t["priority"] == "low"])
-        },
-        "category_breakdown": {
-            "Hardware": len([t for t in tickets_db if t["category"] == "Hardware"]),
-            "Software": len([t for t in tickets_db if t["category"] == "Software"]),
-            "Network": len([t for t in tickets_db if t["category"] == "Network"]),
-            "General": len([t for t in tickets_db if t["category"] == "General"])
-        },
+        "total_tickets": analytics["total_tickets"],
+        "open_tickets": analytics["open_tickets"],
+        "in_progress_tickets": analytics["in_progress_tickets"],
+        "resolved_tickets": analytics["resolved_tickets"],
+        "priority_breakdown": analytics["priority_breakdown"],
+        "category_breakdown": {name: categories.get(name, 0) for name in _ANALYTICS_CATEGORIES},
         "avg_resolution_hours": 24.5,
         "resolution_rate": 85.2
     }
 
 if __name__ == "__main__":
+    debug = os.getenv("DEBUG", "False").lower() == "true"
+    # Users live in process memory (tickets and WebSocket broadcasts too
+    # unless REDIS_URL is set), so this app runs a single worker; see
+    # PROJECT_STRUCTURE.md for multi-worker notes
     uvicorn.run(
         "simple_main_enhanced:app",
         host="127.0.0.1",
         port=8001,
-        reload=True
+        reload=debug,
+        loop="auto",
+        http="auto",
+        # Ping every 30 s and drop clients that miss the pong within 5 s, so
+        # half-closed sockets leave the broadcast set instead of lingering
+        ws_ping_interval=30.0,
+        ws_ping_timeout=5.0,
+        access_log=debug
     )
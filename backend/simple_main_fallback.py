@@ -1,15 +1,22 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 import uvicorn
 import os
 from datetime import datetime
 import random
-import json
+import numpy as np
+import orjson
+
+from services.chat_keywords import ChatCategoryMatcher
+from services.mock_metrics import ALERT_POOL_SIZE, HEALTH_HIGH, HEALTH_LOW, now_iso, pool_alerts, rng, sample_health
 
 app = FastAPI(
     title="Unified IT Support System",
     description="A comprehensive IT support platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -21,13 +28,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def get_intelligent_response(message: str) -> str:
-    """Get intelligent response using pattern matching and knowledge base"""
-    message_lower = message.lower().strip()
+# Compress the text-heavy chat and help replies; small bodies go out as-is
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=6)
 
-    # Greetings and basic interactions
-    if any(word in message_lower for word in ["hi", "hello", "hey", "greetings", "good morning", "good afternoon", "good evening"]):
-        return """👋 **Hello! I'm your AI IT Support Assistant**
+# Static chat replies, built once at import instead of per request
+CHAT_RESPONSES = {
+    "greeting": """👋 **Hello! I'm your AI IT Support Assistant**
 
 I'm here to help you with virtually anything! I can assist with:
 
@@ -53,11 +59,9 @@ I'm here to help you with virtually anything! I can assist with:
 • Help with problem-solving
 • Offer creative solutions
 
-What would you like to know or discuss today?"""
+What would you like to know or discuss today?""",
 
-    # IT Support Topics
-    elif any(word in message_lower for word in ["password", "reset", "forgot", "login", "access", "account"]):
-        return """🔐 **Password & Account Help**
+    "account": """🔐 **Password & Account Help**
 
 I can help you with various account and password issues:
 
@@ -82,10 +86,9 @@ I can help you with various account and password issues:
 • Monitor account activity
 • Use secure networks when logging in
 
-**Need specific help?** Let me know your exact situation and I'll provide tailored guidance!"""
+**Need specific help?** Let me know your exact situation and I'll provide tailored guidance!""",
 
-    elif any(word in message_lower for word in ["vpn", "remote", "connect", "network", "virtual private network"]):
-        return """🌐 **VPN & Network Connectivity**
+    "vpn": """🌐 **VPN & Network Connectivity**
 
 I can help you with VPN setup and network issues:
 
@@ -109,10 +112,9 @@ I can help you with VPN setup and network issues:
 • Bypasses geographic restrictions
 • Maintains privacy and anonymity
 
-**Need the VPN client or having specific issues?** I can provide detailed troubleshooting steps!"""
+**Need the VPN client or having specific issues?** I can provide detailed troubleshooting steps!""",
 
-    elif any(word in message_lower for word in ["slow", "performance", "lag", "freeze", "hanging", "optimize"]):
-        return """⚡ **Performance Optimization & Troubleshooting**
+    "performance": """⚡ **Performance Optimization & Troubleshooting**
 
 I can help diagnose and fix performance issues:
 
@@ -142,10 +144,9 @@ I can help diagnose and fix performance issues:
 • Security concerns or malware
 • Complex software conflicts
 
-**Would you like me to create a support ticket for hands-on assistance?**"""
+**Would you like me to create a support ticket for hands-on assistance?**""",
 
-    elif any(word in message_lower for word in ["software", "install", "application", "program", "app"]):
-        return """💻 **Software Installation & Management**
+    "software": """💻 **Software Installation & Management**
 
 I can help with software installation and management:
 
@@ -177,10 +178,9 @@ I can help with software installation and management:
 • Avoid pirated or cracked software
 • Use company-approved software when possible
 
-**Need help with a specific software installation?** Tell me what you're trying to install!"""
+**Need help with a specific software installation?** Tell me what you're trying to install!""",
 
-    elif any(word in message_lower for word in ["cybersecurity", "security", "hack", "malware", "virus", "phishing"]):
-        return """🛡️ **Cybersecurity & Information Security**
+    "security": """🛡️ **Cybersecurity & Information Security**
 
 I can help you understand and implement cybersecurity best practices:
 
@@ -218,10 +218,9 @@ I can help you understand and implement cybersecurity best practices:
 • **Reporting:** Report suspicious activities immediately
 • **Vigilance:** Stay informed about new threats
 
-**Need specific security guidance?** I can provide detailed information on any security topic!"""
+**Need specific security guidance?** I can provide detailed information on any security topic!""",
 
-    elif any(word in message_lower for word in ["programming", "code", "development", "python", "javascript", "java", "coding"]):
-        return """💻 **Programming & Software Development**
+    "programming": """💻 **Programming & Software Development**
 
 I can help you with programming concepts, code examples, and development best practices:
 
@@ -260,10 +259,9 @@ I can help you with programming concepts, code examples, and development best pr
 • **Practice:** LeetCode, HackerRank, Codewars
 • **Projects:** Build real applications, contribute to open source
 
-**What specific programming topic would you like to explore?** I can provide code examples, explanations, and guidance!"""
+**What specific programming topic would you like to explore?** I can provide code examples, explanations, and guidance!""",
 
-    elif any(word in message_lower for word in ["information", "info", "data", "knowledge", "facts", "details"]):
-        return """📚 **Information & Knowledge**
+    "information": """📚 **Information & Knowledge**
 
 I can help you understand and find information on virtually any topic!
 
@@ -292,9 +290,10 @@ Information is **data that has been processed, organized, and structured** to pr
 • **Academic Topics:** Research, theories, methodologies
 
 **What specific information are you looking for?** I can provide detailed, accurate, and well-sourced information on any topic!"""
+}
 
-    elif any(word in message_lower for word in ["what", "how", "why", "when", "where", "who", "explain", "define", "meaning"]):
-        return f"""🤔 **I'd be happy to help explain that!**
+# Open-ended replies only interpolate the message
+EXPLAIN_RESPONSE_TEMPLATE = """🤔 **I'd be happy to help explain that!**
 
 You asked: **"{message}"**
 
@@ -331,9 +330,7 @@ I can provide detailed explanations on virtually any topic. Here's how I can hel
 
 I'm here to provide clear, comprehensive explanations!"""
 
-    # Default intelligent response
-    else:
-        return f"""🤖 **I'm here to help with anything!**
+UNIVERSAL_RESPONSE_TEMPLATE = """🤖 **I'm here to help with anything!**
 
 I understand you're asking about **"{message}"** - that's a great question!
 
@@ -362,6 +359,36 @@ I understand you're asking about **"{message}"** - that's a great question!
 
 **What would you like to know more about?** Feel free to ask me anything - I'm designed to be helpful, accurate, and comprehensive in my responses!"""
 
+# Confidence used to be derived per request from reply length; every reply is
+# fixed text (templates alone exceed 1000 chars), so it is fixed per branch
+CHAT_CONFIDENCE = {
+    category: min(0.95, max(0.7, len(text) / 1000))
+    for category, text in CHAT_RESPONSES.items()
+}
+EXPLAIN_CONFIDENCE = 0.95
+UNIVERSAL_CONFIDENCE = 0.95
+
+# Static replies serialized once as an open '{"response":"..."' prefix; the
+# small per-call fields are serialized and spliced on in the handler
+CHAT_RESPONSES_JSON = {
+    category: orjson.dumps({"response": text})[:-1]
+    for category, text in CHAT_RESPONSES.items()
+}
+
+# Only categories with a reply here are matched, in the shared priority order
+chat_matcher = ChatCategoryMatcher([*CHAT_RESPONSES, "explain"])
+
+def get_intelligent_response(message: str, message_lower: str) -> tuple:
+    """Get (response, confidence) using pattern matching and knowledge base"""
+    category = chat_matcher.match(message_lower)
+
+    if category is None:
+        # Default intelligent response
+        return UNIVERSAL_RESPONSE_TEMPLATE.format(message=message), UNIVERSAL_CONFIDENCE
+    if category == "explain":
+        return EXPLAIN_RESPONSE_TEMPLATE.format(message=message), EXPLAIN_CONFIDENCE
+    return CHAT_RESPONSES[category], CHAT_CONFIDENCE[category]
+
 @app.get("/")
 async def root():
     return {"message": "Unified IT Support System API", "version": "1.0.0"}
@@ -370,52 +397,43 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "unified-it-support"}
 
+
+# Dashboard ints (upper bounds exclusive): active alerts, total/open/resolved-today
+# tickets, resolution hours, number of alerts to list, alert pool offset
+_METRIC_INT_LOW = np.array([0, 50, 10, 5, 2, 0, 0])
+_METRIC_INT_HIGH = np.array([6, 201, 51, 26, 49, 6, ALERT_POOL_SIZE])
+
+
 @app.get("/api/dashboard/health")
 async def get_system_health():
     """Get current system health metrics."""
-    return {
-        "cpu_usage": round(random.uniform(20, 80), 1),
-        "memory_usage": round(random.uniform(30, 90), 1),
-        "disk_usage": round(random.uniform(10, 70), 1),
-        "uptime_hours": round(random.uniform(24, 168), 1),
-        "active_alerts": random.randint(0, 5),
-        "status": "operational"
-    }
+    return sample_health()
 
 @app.get("/api/dashboard/metrics")
 async def get_dashboard_metrics():
     """Get comprehensive dashboard metrics."""
+    # One draw for every float and one for every int, alert picks included
+    cpu, memory, disk, uptime = rng.uniform(HEALTH_LOW, HEALTH_HIGH).round(1).tolist()
+    (active_alerts, tickets_total, tickets_open, resolved_today,
+     resolution_hours, alert_count, alert_start) = rng.integers(_METRIC_INT_LOW, _METRIC_INT_HIGH).tolist()
+    alert_time = now_iso()
+
     return {
         "system_health": {
-            "cpu_usage": round(random.uniform(20, 80), 1),
-            "memory_usage": round(random.uniform(30, 90), 1),
-            "disk_usage": round(random.uniform(10, 70), 1),
-            "uptime_hours": round(random.uniform(24, 168), 1),
-            "active_alerts": random.randint(0, 5),
+            "cpu_usage": cpu,
+            "memory_usage": memory,
+            "disk_usage": disk,
+            "uptime_hours": uptime,
+            "active_alerts": active_alerts,
             "status": "operational"
         },
         "tickets": {
-            "total": random.randint(50, 200),
-            "open": random.randint(10, 50),
-            "resolved_today": random.randint(5, 25),
-            "avg_resolution_time": f"{random.randint(2, 48)} hours"
+            "total": tickets_total,
+            "open": tickets_open,
+            "resolved_today": resolved_today,
+            "avg_resolution_time": f"{resolution_hours} hours"
         },
-        "alerts": [
-            {
-                "id": random.randint(1000, 9999),
-                "type": random.choice(["warning", "error", "info"]),
-                "message": random.choice([
-                    "High CPU usage detected",
-                    "Memory usage above threshold",
-                    "Disk space running low",
-                    "Network connectivity issue",
-                    "Service restart required"
-                ]),
-                "timestamp": datetime.now().isoformat(),
-                "severity": random.choice(["low", "medium", "high", "critical"])
-            }
-            for _ in range(random.randint(0, 5))
-        ]
+        "alerts": pool_alerts(alert_count, alert_start, alert_time)
     }
 
 @app.post("/api/tickets/create")
@@ -427,8 +445,8 @@ async def create_ticket(ticket_data: dict):
         "description": ticket_data.get("description", ""),
         "priority": ticket_data.get("priority", "medium"),
         "status": "open",
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
+        "created_at": now_iso(),
+        "updated_at": now_iso(),
         "resolved_at": None
     }
 
@@ -446,11 +464,22 @@ async def chat_with_bot(chat_data: dict):
             "ticket_id": None
         }
 
-    # Get intelligent response using pattern matching
-    response_text = get_intelligent_response(message)
+    # Get intelligent response using pattern matching; message is already stripped
+    message_lower = message.lower()
+    category = chat_matcher.match(message_lower)
+    if category in CHAT_RESPONSES_JSON:
+        tail = orjson.dumps({
+            "session_id": f"session_{random.randint(1000, 9999)}",
+            "confidence_score": CHAT_CONFIDENCE[category],
+            "was_escalated": False,
+            "ticket_id": None
+        })
+        return Response(
+            content=CHAT_RESPONSES_JSON[category] + b"," + tail[1:],
+            media_type="application/json"
+        )
 
-    # Calculate confidence based on response length and content
-    confidence = min(0.95, max(0.7, len(response_text) / 1000))
+    response_text, confidence = get_intelligent_response(message, message_lower)
 
     return {
         "response": response_text,
@@ -460,29 +489,32 @@ async def chat_with_bot(chat_data: dict):
         "ticket_id": None
     }
 
+# FAQ entries never change, so they are serialized once at import
+_FAQS_BYTES = orjson.dumps([
+    {
+        "id": 1,
+        "question": "How do I reset my password?",
+        "answer": "Click 'Forgot Password' on the login page and follow the email instructions.",
+        "category": "Account"
+    },
+    {
+        "id": 2,
+        "question": "How do I connect to VPN?",
+        "answer": "Download the VPN client from the IT portal and use your company credentials.",
+        "category": "Network"
+    },
+    {
+        "id": 3,
+        "question": "What are the support hours?",
+        "answer": "IT support is available Monday-Friday, 8 AM - 6 PM. Emergency support is 24/7.",
+        "category": "General"
+    }
+])
+
 @app.get("/api/chatbot/faqs")
 async def get_faqs():
     """Get FAQ entries."""
-    return [
-        {
-            "id": 1,
-            "question": "How do I reset my password?",
-            "answer": "Click 'Forgot Password' on the login page and follow the email instructions.",
-            "category": "Account"
-        },
-        {
-            "id": 2,
-            "question": "How do I connect to VPN?",
-            "answer": "Download the VPN client from the IT portal and use your company credentials.",
-            "category": "Network"
-        },
-        {
-            "id": 3,
-            "question": "What are the support hours?",
-            "answer": "IT support is available Monday-Friday, 8 AM - 6 PM. Emergency support is 24/7.",
-            "category": "General"
-        }
-    ]
+    return Response(_FAQS_BYTES, media_type="application/json")
 
 # Authentication endpoints
 @app.post("/api/auth/login")
@@ -510,7 +542,7 @@ async def register(user_data: dict):
         "full_name": user_data.get("full_name", ""),
         "role": user_data.get("role", "customer"),
         "is_active": True,
-        "created_at": datetime.now().isoformat()
+        "created_at": now_iso()
     }
 
 @app.get("/api/auth/me")
@@ -523,13 +555,20 @@ async def get_current_user():
         "full_name": "Demo User",
         "role": "admin",
         "is_active": True,
-        "created_at": datetime.now().isoformat()
+        "created_at": now_iso()
     }
 
 if __name__ == "__main__":
+    debug = os.getenv("DEBUG", "False").lower() == "true"
+    # Every endpoint here is stateless, so it scales across workers; reload only supports one
     uvicorn.run(
         "simple_main_fallback:app",
         host="127.0.0.1",
         port=8001,
-        reload=True
+        reload=debug,
+        workers=1 if debug else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        loop="auto",
+        http="auto",
+        access_log=debug,
+        log_level="info" if debug else "warning"
     )
@@ -1,9 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 import uvicorn
 import os
 from datetime import datetime
 import random
+import numpy as np
+import orjson
 import openai
 from dotenv import load_dotenv
 from langchain.llms import OpenAI
@@ -12,6 +16,11 @@ from langchain.schema import HumanMessage, SystemMessage
 from langchain.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
 from langchain.chains import LLMChain
 import json
+import hashlib
+from cachetools import TTLCache
+
+from services.mock_metrics import random_alerts, rng, sample_health
+from services.response_formatter import format_response
 
 # Load environment variables
 load_dotenv()
@@ -29,55 +38,8 @@ llm = ChatOpenAI(
     max_tokens=1000
 )
 
-# Create a formatted response template
-def format_response(text: str) -> str:
-    """Format the AI response with proper HTML-like formatting for better display"""
-    # Convert markdown-style formatting to HTML-like formatting
-    formatted = text.replace('**', '<strong>').replace('**', '</strong>')
-    formatted = formatted.replace('*', '<em>').replace('*', '</em>')
-
-    # Convert bullet points to proper HTML lists
-    lines = formatted.split('\n')
-    formatted_lines = []
-    in_list = False
-
-    for line in lines:
-        line = line.strip()
-        if line.startswith('• '):
-            if not in_list:
-                formatted_lines.append('<ul>')
-                in_list = True
-            formatted_lines.append(f'<li>{line[2:]}</li>')
-        elif line.startswith('- '):
-            if not in_list:
-                formatted_lines.append('<ul>')
-                in_list = True
-            formatted_lines.append(f'<li>{line[2:]}</li>')
-        elif line.startswith(('1. ', '2. ', '3. ', '4. ', '5. ', '6. ', '7. ', '8. ', '9. ')):
-            if not in_list:
-                formatted_lines.append('<ol>')
-                in_list = True
-            # Extract number and text
-            parts = line.split('. ', 1)
-            if len(parts) == 2:
-                formatted_lines.append(f'<li>{parts[1]}</li>')
-        else:
-            if in_list:
-                formatted_lines.append('</ul>' if '•' in formatted_lines[-2] or '-' in formatted_lines[-2] else '</ol>')
-                in_list = False
-            if line:
-                formatted_lines.append(f'<p>{line}</p>')
-
-    if in_list:
-        formatted_lines.append('</ul>')
-
-    return '\n'.join(formatted_lines)
-
-async def get_langchain_response(message: str) -> str:
-    """Get response using LangChain with OpenRouter"""
-    try:
-        # Create a system prompt for IT support
-        system_prompt = """You are an AI assistant for an IT Support System. You are helpful, knowledgeable, and professional.
+# System prompt for IT support
+_SYSTEM_PROMPT = """You are an AI assistant for an IT Support System. You are helpful, knowledgeable, and professional.
         You can answer questions about technology, IT support, programming, science, business, health, travel, and virtually any topic.
 
         IMPORTANT FORMATTING RULES:
@@ -91,20 +53,33 @@ async def get_langchain_response(message: str) -> str:
         - For other topics, be comprehensive and helpful
         - Always provide actionable advice and next steps"""
 
-        # Create the prompt template
-        prompt = ChatPromptTemplate.from_messages([
-            SystemMessagePromptTemplate.from_template(system_prompt),
-            HumanMessagePromptTemplate.from_template("{input}")
-        ])
+# The prompt template and chain are constant, so they are built once at import
+_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessagePromptTemplate.from_template(_SYSTEM_PROMPT),
+    HumanMessagePromptTemplate.from_template("{input}")
+])
+_CHAIN = LLMChain(llm=llm, prompt=_PROMPT)
+
+# Replies keyed by normalized prompt; errors are never cached
+_chat_cache = TTLCache(maxsize=1024, ttl=3600)
 
-        # Create the chain
-        chain = LLMChain(llm=llm, prompt=prompt)
+def _chat_cache_key(message: str) -> bytes:
+    return hashlib.blake2b(message.strip().lower().encode(), digest_size=16).digest()
 
+async def get_langchain_response(message: str) -> str:
+    """Get response using LangChain with OpenRouter"""
+    key = _chat_cache_key(message)
+    cached = _chat_cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
         # Get response
-        response = await chain.arun(input=message)
+        response = await _CHAIN.arun(input=message)
 
         # Format the response
         formatted_response = format_response(response)
+        _chat_cache[key] = formatted_response
 
         return formatted_response
 
@@ -118,7 +93,8 @@ async def get_langchain_response(message: str) -> str:
 app = FastAPI(
     title="Unified IT Support System",
     description="A comprehensive IT support platform with AI-powered FAQ Chatbot using LangChain + OpenAI",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -130,68 +106,83 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress the text-heavy chat replies and dashboard payloads; small bodies go out as-is
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=6)
+
+# Constant payloads serialized once at import
+_ROOT_BYTES = orjson.dumps({"message": "Unified IT Support System API with LangChain + OpenAI", "version": "1.0.0"})
+_HEALTH_BYTES = orjson.dumps({"status": "healthy", "service": "unified-it-support", "ai_engine": "langchain-openrouter"})
+
+_FAQS_BYTES = orjson.dumps([
+    {
+        "id": 1,
+        "question": "How do I reset my password?",
+        "answer": "Click 'Forgot Password' on the login page and follow the email instructions.",
+        "category": "Account"
+    },
+    {
+        "id": 2,
+        "question": "How do I connect to VPN?",
+        "answer": "Download the VPN client from the IT portal and use your company credentials.",
+        "category": "Network"
+    },
+    {
+        "id": 3,
+        "question": "What are the support hours?",
+        "answer": "IT support is available Monday-Friday, 8 AM - 6 PM. Emergency support is 24/7.",
+        "category": "General"
+    },
+    {
+        "id": 4,
+        "question": "How does the AI chatbot work?",
+        "answer": "Our AI chatbot uses LangChain + OpenAI technology to provide intelligent, contextual responses to your questions.",
+        "category": "AI Support"
+    }
+])
+
 @app.get("/")
 async def root():
-    return {"message": "Unified IT Support System API with LangChain + OpenAI", "version": "1.0.0"}
+    return Response(_ROOT_BYTES, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "unified-it-support", "ai_engine": "langchain-openrouter"}
+    return Response(_HEALTH_BYTES, media_type="application/json")
 
 @app.get("/api/dashboard/health")
 async def get_system_health():
     """Get current system health metrics."""
-    return {
-        "cpu_usage": round(random.uniform(20, 80), 1),
-        "memory_usage": round(random.uniform(30, 90), 1),
-        "disk_usage": round(random.uniform(10, 70), 1),
-        "uptime_hours": round(random.uniform(24, 168), 1),
-        "active_alerts": random.randint(0, 5),
-        "status": "operational",
-        "ai_status": "active"
-    }
+    return {**sample_health(), "ai_status": "active"}
+
+# Dashboard ints (upper bounds exclusive): chatbot queries/successes/sessions,
+# total/open/resolved-today tickets, resolution hours, number of alerts
+_METRIC_INT_LOW = np.array([100, 95, 5, 50, 10, 5, 2, 0])
+_METRIC_INT_HIGH = np.array([1001, 101, 51, 201, 51, 26, 49, 6])
+# Dashboard floats: chatbot response time, satisfaction
+_METRIC_FLOAT_LOW = np.array([0.5, 4.0])
+_METRIC_FLOAT_HIGH = np.array([2.0, 5.0])
 
 @app.get("/api/dashboard/metrics")
 async def get_dashboard_metrics():
     """Get comprehensive dashboard metrics."""
+    (total_queries, successful_responses, active_sessions, total, open_tickets,
+     resolved_today, resolution_hours, alert_count) = rng.integers(_METRIC_INT_LOW, _METRIC_INT_HIGH).tolist()
+    response_time, satisfaction = rng.uniform(_METRIC_FLOAT_LOW, _METRIC_FLOAT_HIGH).tolist()
     return {
-        "system_health": {
-            "cpu_usage": round(random.uniform(20, 80), 1),
-            "memory_usage": round(random.uniform(30, 90), 1),
-            "disk_usage": round(random.uniform(10, 70), 1),
-            "uptime_hours": round(random.uniform(24, 168), 1),
-            "active_alerts": random.randint(0, 5),
-            "status": "operational"
-        },
+        "system_health": sample_health(),
         "ai_chatbot": {
-            "total_queries": random.randint(100, 1000),
-            "successful_responses": random.randint(95, 100),
-            "avg_response_time": f"{random.uniform(0.5, 2.0):.1f}s",
-            "active_sessions": random.randint(5, 50),
-            "satisfaction_score": round(random.uniform(4.0, 5.0), 1)
+            "total_queries": total_queries,
+            "successful_responses": successful_responses,
+            "avg_response_time": f"{response_time:.1f}s",
+            "active_sessions": active_sessions,
+            "satisfaction_score": round(satisfaction, 1)
         },
         "tickets": {
-            "total": random.randint(50, 200),
-            "open": random.randint(10, 50),
-            "resolved_today": random.randint(5, 25),
-            "avg_resolution_time": f"{random.randint(2, 48)} hours"
+            "total": total,
+            "open": open_tickets,
+            "resolved_today": resolved_today,
+            "avg_resolution_time": f"{resolution_hours} hours"
         },
-        "alerts": [
-            {
-                "id": random.randint(1000, 9999),
-                "type": random.choice(["warning", "error", "info"]),
-                "message": random.choice([
-                    "High CPU usage detected",
-                    "Memory usage above threshold",
-                    "Disk space running low",
-                    "Network connectivity issue",
-                    "Service restart required"
-                ]),
-                "timestamp": datetime.now().isoformat(),
-                "severity": random.choice(["low", "medium", "high", "critical"])
-            }
-            for _ in range(random.randint(0, 5))
-        ]
+        "alerts": random_alerts(alert_count)
     }
 
 @app.post("/api/tickets/create")
@@ -241,32 +232,7 @@ async def chat_with_bot(chat_data: dict):
 @app.get("/api/chatbot/faqs")
 async def get_faqs():
     """Get FAQ entries."""
-    return [
-        {
-            "id": 1,
-            "question": "How do I reset my password?",
-            "answer": "Click 'Forgot Password' on the login page and follow the email instructions.",
-            "category": "Account"
-        },
-        {
-            "id": 2,
-            "question": "How do I connect to VPN?",
-            "answer": "Download the VPN client from the IT portal and use your company credentials.",
-            "category": "Network"
-        },
-        {
-            "id": 3,
-            "question": "What are the support hours?",
-            "answer": "IT support is available Monday-Friday, 8 AM - 6 PM. Emergency support is 24/7.",
-            "category": "General"
-        },
-        {
-            "id": 4,
-            "question": "How does the AI chatbot work?",
-            "answer": "Our AI chatbot uses LangChain + OpenAI technology to provide intelligent, contextual responses to your questions.",
-            "category": "AI Support"
-        }
-    ]
+    return Response(_FAQS_BYTES, media_type="application/json")
 
 @app.get("/api/chatbot/analytics")
 async def get_chatbot_analytics():
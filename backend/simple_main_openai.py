@@ -1,11 +1,23 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 import uvicorn
 import os
 from datetime import datetime
 import random
+import numpy as np
+import orjson
+import asyncio
+import httpx
 import openai
 from dotenv import load_dotenv
+import hashlib
+from cachetools import TTLCache
+
+from services.mock_metrics import random_alerts, rng, sample_health
+from services.micro_batcher import MicroBatcher
+from services.semantic_cache import SemanticCache
 
 # Load environment variables
 load_dotenv()
@@ -13,33 +25,136 @@ load_dotenv()
 # Configure OpenAI
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
+# Shared client so chat calls reuse the same connection pool and TLS sessions
+_openai_client = None
+
+def get_openai_client() -> openai.AsyncOpenAI:
+    # Created on first use so a missing API key surfaces as a chat error, not an import error
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = openai.AsyncOpenAI(
+            api_key=openai.api_key,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                http2=True
+            )
+        )
+    return _openai_client
+
+# Replies keyed by normalized prompt; errors are never cached
+_chat_cache = TTLCache(maxsize=1024, ttl=3600)
+
+def _chat_cache_key(message: str) -> bytes:
+    return hashlib.blake2b(message.strip().lower().encode(), digest_size=16).digest()
+
+async def embed_message(message: str) -> list:
+    """Embed a chat message for the semantic response cache"""
+    response = await get_openai_client().embeddings.create(
+        model="text-embedding-3-small",
+        input=message
+    )
+    return response.data[0].embedding
+
+# Paraphrased questions are answered from cache instead of calling OpenAI
+response_cache = SemanticCache(
+    embed=embed_message,
+    threshold=0.92,
+    redis_url=os.getenv("REDIS_URL")
+)
+
+# Kept constant and first in the message list so OpenAI's automatic prompt
+# caching can reuse the prefix; only the user message varies
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": """You are an AI assistant for an IT Support System. You are helpful, knowledgeable, and professional.
+                You can answer questions about technology, IT support, programming, science, business, health, travel, and virtually any topic.
+                Always provide detailed, well-formatted responses with emojis and clear structure. Be conversational but informative.
+                If it's an IT-related question, provide specific technical guidance. For other topics, be comprehensive and helpful."""
+}
+
+def _chat_messages(message: str) -> list:
+    return [_SYSTEM_MESSAGE, {"role": "user", "content": message}]
+
+async def _create_completion(message: str, stream: bool = False):
+    return await get_openai_client().chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=_chat_messages(message),
+        max_tokens=1000,
+        temperature=0.7,
+        stream=stream
+    )
+
+# Batches now overlap, so cap upstream calls in flight across all of them
+openai_semaphore = asyncio.Semaphore(50)
+
+async def fetch_openai_response(message: str) -> str:
+    """Call the OpenAI chat API; errors propagate so they are never cached"""
+    async with openai_semaphore:
+        response = await _create_completion(message)
+    return response.choices[0].message.content
+
+async def fetch_openai_batch(messages: list) -> list:
+    """Send a drained batch of prompts as concurrent upstream requests"""
+    return await asyncio.gather(
+        *(fetch_openai_response(message) for message in messages),
+        return_exceptions=True
+    )
+
+# Prompts arriving within 20 ms are dispatched together
+chat_batcher = MicroBatcher(fetch_openai_batch, max_batch=16, max_wait=0.02)
+
 async def get_openai_response(message: str) -> str:
     """Get response from OpenAI API"""
+    key = _chat_cache_key(message)
+    cached = _chat_cache.get(key)
+    if cached is not None:
+        return cached
+
     try:
-        client = openai.AsyncOpenAI(api_key=openai.api_key)
-        response = await client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are an AI assistant for an IT Support System. You are helpful, knowledgeable, and professional.
-                    You can answer questions about technology, IT support, programming, science, business, health, travel, and virtually any topic.
-                    Always provide detailed, well-formatted responses with emojis and clear structure. Be conversational but informative.
-                    If it's an IT-related question, provide specific technical guidance. For other topics, be comprehensive and helpful."""
-                },
-                {"role": "user", "content": message}
-            ],
-            max_tokens=1000,
-            temperature=0.7
-        )
-        return response.choices[0].message.content
+        content = await response_cache.get_or_compute(message, chat_batcher.submit)
+        _chat_cache[key] = content
+        return content
     except Exception as e:
-        return f"I apologize, but I'm having trouble connecting to my AI service right now. Error: {str(e)}. Please try again later or contact support."
+        return _chat_error_text(e)
+
+def _chat_error_text(error: Exception) -> str:
+    return f"I apologize, but I'm having trouble connecting to my AI service right now. Error: {str(error)}. Please try again later or contact support."
+
+def _sse_event(payload: dict) -> bytes:
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+async def stream_openai_response(message: str):
+    """Stream reply deltas as server-sent events, then a done event"""
+    key = _chat_cache_key(message)
+    cached = _chat_cache.get(key)
+    if cached is not None:
+        yield _sse_event({"delta": cached})
+    else:
+        try:
+            parts = []
+            # Hold a slot for the whole stream; its connection stays open longest
+            async with openai_semaphore:
+                stream = await _create_completion(message, stream=True)
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield _sse_event({"delta": delta})
+            _chat_cache[key] = "".join(parts)
+        except Exception as e:
+            yield _sse_event({"delta": _chat_error_text(e)})
+
+    yield _sse_event({
+        "done": True,
+        "session_id": f"session_{random.randint(1000, 9999)}"
+    })
 
 app = FastAPI(
     title="Unified IT Support System",
     description="A comprehensive IT support platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -51,60 +166,75 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress the text-heavy chat replies and dashboard payloads; small bodies go out as-is
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=6)
+
+@app.on_event("shutdown")
+async def close_chat_batcher():
+    await chat_batcher.close()
+
+@app.on_event("shutdown")
+async def close_openai_client():
+    if _openai_client is not None:
+        await _openai_client.close()
+
+# Constant payloads serialized once at import
+_ROOT_BYTES = orjson.dumps({"message": "Unified IT Support System API", "version": "1.0.0"})
+_HEALTH_BYTES = orjson.dumps({"status": "healthy", "service": "unified-it-support"})
+
+_FAQS_BYTES = orjson.dumps([
+    {
+        "id": 1,
+        "question": "How do I reset my password?",
+        "answer": "Click 'Forgot Password' on the login page and follow the email instructions.",
+        "category": "Account"
+    },
+    {
+        "id": 2,
+        "question": "How do I connect to VPN?",
+        "answer": "Download the VPN client from the IT portal and use your company credentials.",
+        "category": "Network"
+    },
+    {
+        "id": 3,
+        "question": "What are the support hours?",
+        "answer": "IT support is available Monday-Friday, 8 AM - 6 PM. Emergency support is 24/7.",
+        "category": "General"
+    }
+])
+
 @app.get("/")
 async def root():
-    return {"message": "Unified IT Support System API", "version": "1.0.0"}
+    return Response(_ROOT_BYTES, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "unified-it-support"}
+    return Response(_HEALTH_BYTES, media_type="application/json")
 
 @app.get("/api/dashboard/health")
 async def get_system_health():
     """Get current system health metrics."""
-    return {
-        "cpu_usage": round(random.uniform(20, 80), 1),
-        "memory_usage": round(random.uniform(30, 90), 1),
-        "disk_usage": round(random.uniform(10, 70), 1),
-        "uptime_hours": round(random.uniform(24, 168), 1),
-        "active_alerts": random.randint(0, 5),
-        "status": "operational"
-    }
+    return sample_health()
+
+# Dashboard ints (upper bounds exclusive): total/open/resolved-today tickets,
+# resolution hours, number of alerts
+_METRIC_INT_LOW = np.array([50, 10, 5, 2, 0])
+_METRIC_INT_HIGH = np.array([201, 51, 26, 49, 6])
 
 @app.get("/api/dashboard/metrics")
 async def get_dashboard_metrics():
     """Get comprehensive dashboard metrics."""
+    (total, open_tickets, resolved_today,
+     resolution_hours, alert_count) = rng.integers(_METRIC_INT_LOW, _METRIC_INT_HIGH).tolist()
     return {
-        "system_health": {
-            "cpu_usage": round(random.uniform(20, 80), 1),
-            "memory_usage": round(random.uniform(30, 90), 1),
-            "disk_usage": round(random.uniform(10, 70), 1),
-            "uptime_hours": round(random.uniform(24, 168), 1),
-            "active_alerts": random.randint(0, 5),
-            "status": "operational"
-        },
+        "system_health": sample_health(),
         "tickets": {
-            "total": random.randint(50, 200),
-            "open": random.randint(10, 50),
-            "resolved_today": random.randint(5, 25),
-            "avg_resolution_time": f"{random.randint(2, 48)} hours"
+            "total": total,
+            "open": open_tickets,
+            "resolved_today": resolved_today,
+            "avg_resolution_time": f"{resolution_hours} hours"
         },
-        "alerts": [
-            {
-                "id": random.randint(1000, 9999),
-                "type": random.choice(["warning", "error", "info"]),
-                "message": random.choice([
-                    "High CPU usage detected",
-                    "Memory usage above threshold",
-                    "Disk space running low",
-                    "Network connectivity issue",
-                    "Service restart required"
-                ]),
-                "timestamp": datetime.now().isoformat(),
-                "severity": random.choice(["low", "medium", "high", "critical"])
-            }
-            for _ in range(random.randint(0, 5))
-        ]
+        "alerts": random_alerts(alert_count)
     }
 
 @app.post("/api/tickets/create")
@@ -135,6 +265,15 @@ async def chat_with_bot(chat_data: dict):
             "ticket_id": None
         }
 
+    if chat_data.get("stream"):
+        # Opt-in streaming: tokens arrive as they are generated instead of after the full reply
+        return StreamingResponse(
+            stream_openai_response(message),
+            media_type="text/event-stream",
+            # GZip skips bodies with an encoding set, so events are not held in the compressor
+            headers={"cache-control": "no-cache", "content-encoding": "identity"}
+        )
+
     # Get response from OpenAI
     response_text = await get_openai_response(message)
 
@@ -149,29 +288,15 @@ async def chat_with_bot(chat_data: dict):
         "ticket_id": None
     }
 
+@app.get("/api/chatbot/cache/stats")
+async def get_chat_cache_stats():
+    """Get semantic response cache hit/miss counters."""
+    return response_cache.stats()
+
 @app.get("/api/chatbot/faqs")
 async def get_faqs():
     """Get FAQ entries."""
-    return [
-        {
-            "id": 1,
-            "question": "How do I reset my password?",
-            "answer": "Click 'Forgot Password' on the login page and follow the email instructions.",
-            "category": "Account"
-        },
-        {
-            "id": 2,
-            "question": "How do I connect to VPN?",
-            "answer": "Download the VPN client from the IT portal and use your company credentials.",
-            "category": "Network"
-        },
-        {
-            "id": 3,
-            "question": "What are the support hours?",
-            "answer": "IT support is available Monday-Friday, 8 AM - 6 PM. Emergency support is 24/7.",
-            "category": "General"
-        }
-    ]
+    return Response(_FAQS_BYTES, media_type="application/json")
 
 # Authentication endpoints
 @app.post("/api/auth/login")
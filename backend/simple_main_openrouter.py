@@ -1,12 +1,19 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 import uvicorn
 import os
 from datetime import datetime
 import random
+import numpy as np
+import orjson
+import httpx
 import openai
 from dotenv import load_dotenv
 
+from services.mock_metrics import random_alerts, rng, sample_health
+
 # Load environment variables
 load_dotenv()
 
@@ -14,14 +21,28 @@ load_dotenv()
 openai.api_key = os.getenv("OPENAI_API_KEY")
 openai.api_base = "https://openrouter.ai/api/v1"
 
+# Shared client so chat calls reuse the same connection pool and TLS sessions
+_openai_client = None
+
+def get_openai_client() -> openai.AsyncOpenAI:
+    # Created on first use so a missing API key surfaces as a chat error, not an import error
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = openai.AsyncOpenAI(
+            api_key=openai.api_key,
+            base_url=openai.api_base,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                http2=True
+            )
+        )
+    return _openai_client
+
 async def get_openrouter_response(message: str) -> str:
     """Get response from OpenRouter API"""
     try:
-        client = openai.AsyncOpenAI(
-            api_key=openai.api_key,
-            base_url=openai.api_base
-        )
-        response = await client.chat.completions.create(
+        response = await get_openai_client().chat.completions.create(
             model="openai/gpt-3.5-turbo",  # OpenRouter model format
             messages=[
                 {
@@ -43,7 +64,8 @@ async def get_openrouter_response(message: str) -> str:
 app = FastAPI(
     title="Unified IT Support System",
     description="A comprehensive IT support platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -55,60 +77,71 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress the text-heavy chat replies and dashboard payloads; small bodies go out as-is
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=6)
+
+@app.on_event("shutdown")
+async def close_openai_client():
+    if _openai_client is not None:
+        await _openai_client.close()
+
+# Constant payloads serialized once at import
+_ROOT_BYTES = orjson.dumps({"message": "Unified IT Support System API", "version": "1.0.0"})
+_HEALTH_BYTES = orjson.dumps({"status": "healthy", "service": "unified-it-support"})
+
+_FAQS_BYTES = orjson.dumps([
+    {
+        "id": 1,
+        "question": "How do I reset my password?",
+        "answer": "Click 'Forgot Password' on the login page and follow the email instructions.",
+        "category": "Account"
+    },
+    {
+        "id": 2,
+        "question": "How do I connect to VPN?",
+        "answer": "Download the VPN client from the IT portal and use your company credentials.",
+        "category": "Network"
+    },
+    {
+        "id": 3,
+        "question": "What are the support hours?",
+        "answer": "IT support is available Monday-Friday, 8 AM - 6 PM. Emergency support is 24/7.",
+        "category": "General"
+    }
+])
+
 @app.get("/")
 async def root():
-    return {"message": "Unified IT Support System API", "version": "1.0.0"}
+    return Response(_ROOT_BYTES, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "unified-it-support"}
+    return Response(_HEALTH_BYTES, media_type="application/json")
 
 @app.get("/api/dashboard/health")
 async def get_system_health():
     """Get current system health metrics."""
-    return {
-        "cpu_usage": round(random.uniform(20, 80), 1),
-        "memory_usage": round(random.uniform(30, 90), 1),
-        "disk_usage": round(random.uniform(10, 70), 1),
-        "uptime_hours": round(random.uniform(24, 168), 1),
-        "active_alerts": random.randint(0, 5),
-        "status": "operational"
-    }
+    return sample_health()
+
+# Dashboard ints (upper bounds exclusive): total/open/resolved-today tickets,
+# resolution hours, number of alerts
+_METRIC_INT_LOW = np.array([50, 10, 5, 2, 0])
+_METRIC_INT_HIGH = np.array([201, 51, 26, 49, 6])
 
 @app.get("/api/dashboard/metrics")
 async def get_dashboard_metrics():
     """Get comprehensive dashboard metrics."""
+    (total, open_tickets, resolved_today,
+     resolution_hours, alert_count) = rng.integers(_METRIC_INT_LOW, _METRIC_INT_HIGH).tolist()
     return {
-        "system_health": {
-            "cpu_usage": round(random.uniform(20, 80), 1),
-            "memory_usage": round(random.uniform(30, 90), 1),
-            "disk_usage": round(random.uniform(10, 70), 1),
-            "uptime_hours": round(random.uniform(24, 168), 1),
-            "active_alerts": random.randint(0, 5),
-            "status": "operational"
-        },
+        "system_health": sample_health(),
         "tickets": {
-            "total": random.randint(50, 200),
-            "open": random.randint(10, 50),
-            "resolved_today": random.randint(5, 25),
-            "avg_resolution_time": f"{random.randint(2, 48)} hours"
+            "total": total,
+            "open": open_tickets,
+            "resolved_today": resolved_today,
+            "avg_resolution_time": f"{resolution_hours} hours"
         },
-        "alerts": [
-            {
-                "id": random.randint(1000, 9999),
-                "type": random.choice(["warning", "error", "info"]),
-                "message": random.choice([
-                    "High CPU usage detected",
-                    "Memory usage above threshold",
-                    "Disk space running low",
-                    "Network connectivity issue",
-                    "Service restart required"
-                ]),
-                "timestamp": datetime.now().isoformat(),
-                "severity": random.choice(["low", "medium", "high", "critical"])
-            }
-            for _ in range(random.randint(0, 5))
-        ]
+        "alerts": random_alerts(alert_count)
     }
 
 @app.post("/api/tickets/create")
@@ -156,26 +189,7 @@ async def chat_with_bot(chat_data: dict):
 @app.get("/api/chatbot/faqs")
 async def get_faqs():
     """Get FAQ entries."""
-    return [
-        {
-            "id": 1,
-            "question": "How do I reset my password?",
-            "answer": "Click 'Forgot Password' on the login page and follow the email instructions.",
-            "category": "Account"
-        },
-        {
-            "id": 2,
-            "question": "How do I connect to VPN?",
-            "answer": "Download the VPN client from the IT portal and use your company credentials.",
-            "category": "Network"
-        },
-        {
-            "id": 3,
-            "question": "What are the support hours?",
-            "answer": "IT support is available Monday-Friday, 8 AM - 6 PM. Emergency support is 24/7.",
-            "category": "General"
-        }
-    ]
+    return Response(_FAQS_BYTES, media_type="application/json")
 
 # Authentication endpoints
 @app.post("/api/auth/login")
@@ -2,12 +2,13 @@
 """
 Simple test server for registration endpoint
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Enum
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.sql import func
 from passlib.context import CryptContext
 import enum
@@ -15,12 +16,19 @@ import uvicorn
 
 # Database setup
 DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    # Sessions check connections out of a pool instead of opening one per request
+    pool_size=20,
+    max_overflow=40,
+    pool_pre_ping=True
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing; this test server trades the default 12 bcrypt rounds for 10
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=10)
 
 # Enums
 class UserRole(str, enum.Enum):
@@ -84,23 +92,12 @@ def get_db():
     finally:
         db.close()
 
+# A plain def runs in FastAPI's threadpool, so blocking queries and hashing
+# do not stall the event loop
 @app.post("/api/auth/register", response_model=UserResponse)
-async def register(user_data: UserCreate):
+def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user"""
-    db = SessionLocal()
     try:
-        # Check if user already exists
-        existing_user = db.query(User).filter(
-            (User.username == user_data.username) | (User.email == user_data.email)
-        ).first()
-
-        if existing_user:
-            raise HTTPException(
-                status_code=400,
-                detail="Username or email already registered"
-            )
-
-        # Create new user
         hashed_password = pwd_context.hash(user_data.password)
 
         # Map role string to UserRole enum
@@ -111,24 +108,31 @@ async def register(user_data: UserCreate):
         }
         user_role = role_mapping.get(user_data.role.lower(), UserRole.CUSTOMER)
 
-        db_user = User(
+        # One atomic statement: the unique username/email indexes reject
+        # duplicates, and no row comes back when either one is taken
+        stmt = insert(User).values(
             username=user_data.username,
             email=user_data.email,
             hashed_password=hashed_password,
             full_name=user_data.full_name,
             role=user_role
-        )
+        ).on_conflict_do_nothing().returning(User.id)
+        inserted = db.execute(stmt).first()
 
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        if inserted is None:
+            db.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail="Username or email already registered"
+            )
 
-        return db_user
+        db.commit()
+        return db.get(User, inserted.id)
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
-    finally:
-        db.close()
 
 @app.get("/")
 async def root():
@@ -2,12 +2,17 @@
 """
 Test health endpoint
 """
-import requests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tests.http_session import SESSION
 
 def test_health():
     """Test the health endpoint"""
     try:
-        response = requests.get("http://127.0.0.1:8001/health")
+        response = SESSION.get("http://127.0.0.1:8001/health")
         print(f"Health check - Status: {response.status_code}")
         print(f"Health check - Response: {response.text}")
         return response.status_code == 200
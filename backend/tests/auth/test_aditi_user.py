@@ -3,9 +3,15 @@
 Test script specifically for aditi_bansal user
 """
 
+import os
+import sys
 import requests
 import json
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tests.http_session import SESSION
+
 def test_aditi_user():
     """Test authentication with aditi_bansal user"""
 
@@ -22,7 +28,7 @@ def test_aditi_user():
     }
 
     try:
-        response = requests.post(f"{base_url}/api/auth/login", json=login_data)
+        response = SESSION.post(f"{base_url}/api/auth/login", json=login_data)
         if response.status_code == 200:
             data = response.json()
             token = data.get("access_token")
@@ -34,7 +40,7 @@ def test_aditi_user():
             # Test 2: Get current user with token
             print("\n2. Testing get current user with token...")
             headers = {"Authorization": f"Bearer {token}"}
-            me_response = requests.get(f"{base_url}/api/auth/me", headers=headers)
+            me_response = SESSION.get(f"{base_url}/api/auth/me", headers=headers)
 
             if me_response.status_code == 200:
                 me_data = me_response.json()
@@ -2,17 +2,25 @@
 """
 Test registration with a new user
 """
+import asyncio
+import httpx
 import requests
 import json
+import os
 import random
+import sys
 
-def test_new_user_registration():
-    """Test registration with a new user"""
-    url = "http://127.0.0.1:8001/api/auth/register"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-    # Generate unique username and email
-    random_id = random.randint(1000, 9999)
-    test_data = {
+from tests.http_session import SESSION
+
+BASE_URL = "http://127.0.0.1:8001"
+
+def make_user(random_id=None):
+    """Registration payload with a unique username and email"""
+    if random_id is None:
+        random_id = random.randint(1000, 9999)
+    return {
         "username": f"testuser{random_id}",
         "email": f"test{random_id}@example.com",
         "password": "testpass123",
@@ -20,11 +28,18 @@ def test_new_user_registration():
         "role": "customer"
     }
 
+def test_new_user_registration():
+    """Test registration with a new user"""
+    url = f"{BASE_URL}/api/auth/register"
+
+    # Generate unique username and email
+    test_data = make_user()
+
     try:
         print(f"Sending request to: {url}")
         print(f"Request data: {json.dumps(test_data, indent=2)}")
 
-        response = requests.post(url, json=test_data)
+        response = SESSION.post(url, json=test_data)
         print(f"Status Code: {response.status_code}")
         print(f"Response Headers: {dict(response.headers)}")
         print(f"Response Text: {response.text}")
@@ -48,5 +63,26 @@ def test_new_user_registration():
         print(f"❌ Error: {e}")
         return False
 
+async def register_many(n=100):
+    """Register n users concurrently to load the registration endpoint"""
+    # Spread ids over a wider range than the single test so n users rarely collide
+    ids = random.sample(range(100000, 1000000), n)
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=30.0) as client:
+        responses = await asyncio.gather(
+            *(client.post("/api/auth/register", json=make_user(random_id)) for random_id in ids),
+            return_exceptions=True
+        )
+
+    ok = sum(1 for r in responses if not isinstance(r, Exception) and r.status_code == 200)
+    errors = [r for r in responses if isinstance(r, Exception)]
+    print(f"Registered {ok}/{n} users")
+    if errors:
+        print(f"❌ {len(errors)} requests failed, e.g. {errors[0]!r}")
+    return ok == n
+
 if __name__ == "__main__":
-    test_new_user_registration()
+    # python test_new_user.py [n] registers n users concurrently; no argument runs the single test
+    if len(sys.argv) > 1:
+        asyncio.run(register_many(int(sys.argv[1])))
+    else:
+        test_new_user_registration()
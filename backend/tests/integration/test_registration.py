@@ -2,9 +2,15 @@
 """
 Test script for registration endpoint
 """
+import os
+import sys
 import requests
 import json
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tests.http_session import SESSION
+
 def test_registration():
     """Test the registration endpoint"""
     url = "http://127.0.0.1:8000/api/auth/register"
@@ -18,7 +24,7 @@ def test_registration():
     }
 
     try:
-        response = requests.post(url, json=test_data)
+        response = SESSION.post(url, json=test_data)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
 
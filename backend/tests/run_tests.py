@@ -25,7 +25,8 @@ def run_tests():
     test_categories = {
         "Authentication Tests": "tests/auth",
         "API Tests": "tests/api",
-        "Integration Tests": "tests/integration"
+        "Integration Tests": "tests/integration",
+        "Unit Tests": "tests/unit"
     }
 
     results = {}
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test KeywordIndex matching and scoring
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.keyword_index import KeywordIndex, argmax
+
+TABLE = {
+    "incident": frozenset(["down", "outage", "system down", "service unavailable"]),
+    "performance": frozenset(["slow", "response time", "cpu"]),
+    "request": frozenset(["add", "new"]),
+}
+
+def test_single_words_match_whole_tokens_only():
+    index = KeywordIndex(TABLE)
+    assert index.matches("please check my address") == set()
+    assert index.matches("add a new printer") == {"add", "new"}
+    assert index.matches("cpu") == {"cpu"}
+
+def test_phrases_respect_word_boundaries():
+    index = KeywordIndex(TABLE)
+    assert index.matches("the system down since noon") == {"system down", "down"}
+    assert index.matches("response timer expired") == set()
+    assert index.matches("response time is high") == {"response time"}
+    # Phrase fragments split across texts do not match
+    assert index.matches("system", "down") == {"down"}
+
+def test_scores_count_distinct_keywords_per_bucket():
+    index = KeywordIndex(TABLE)
+    scores = index.scores("outage: service unavailable, system down", "it is slow, down again")
+    assert scores == {"incident": 4, "performance": 1, "request": 0}
+
+def test_score_matches_ignores_foreign_keywords():
+    index = KeywordIndex(TABLE)
+    scores = index.score_matches({"slow", "cpu", "printer"})
+    assert scores == {"incident": 0, "performance": 2, "request": 0}
+
+def test_argmax_first_key_wins_ties_and_default_when_empty():
+    assert argmax({"a": 1, "b": 3, "c": 3}) == ("b", 3)
+    assert argmax({}, default="other") == ("other", 0)
+
+if __name__ == "__main__":
+    test_single_words_match_whole_tokens_only()
+    test_phrases_respect_word_boundaries()
+    test_scores_count_distinct_keywords_per_bucket()
+    test_score_matches_ignores_foreign_keywords()
+    test_argmax_first_key_wins_ties_and_default_when_empty()
+    print("✅ KeywordIndex tests passed")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test MicroBatcher concurrency and failure propagation
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.micro_batcher import MicroBatcher
+
+def test_batches_run_concurrently():
+    """A slow batch must not hold up the batches queued behind it"""
+    async def slow_handler(items):
+        await asyncio.sleep(0.5)
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(slow_handler, max_batch=16, max_wait=0.01)
+        start = time.perf_counter()
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(64)))
+        elapsed = time.perf_counter() - start
+        await batcher.close()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(run())
+    assert results == [i * 2 for i in range(64)]
+    assert elapsed < 1.0, f"64 items took {elapsed:.2f}s, batches ran serially"
+
+def test_handler_failure_propagates():
+    """A raising handler fails every item in its batch, not later batches"""
+    async def handler(items):
+        if "bad" in items:
+            raise ValueError("upstream down")
+        return items
+
+    async def run():
+        batcher = MicroBatcher(handler, max_batch=4, max_wait=0.01)
+        failed = await asyncio.gather(batcher.submit("bad"), batcher.submit("ok"),
+                                      return_exceptions=True)
+        later = await batcher.submit("fine")
+        await batcher.close()
+        return failed, later
+
+    failed, later = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in failed)
+    assert later == "fine"
+
+def test_per_item_exceptions():
+    """Exception instances returned by the handler fail only their own item"""
+    async def handler(items):
+        return [KeyError(i) if i % 2 else i for i in items]
+
+    async def run():
+        batcher = MicroBatcher(handler, max_batch=8, max_wait=0.01)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(4)),
+                                       return_exceptions=True)
+        await batcher.close()
+        return results
+
+    results = asyncio.run(run())
+    assert results[0] == 0 and results[2] == 2
+    assert isinstance(results[1], KeyError) and isinstance(results[3], KeyError)
+
+def test_close_fails_pending_callers():
+    """close() must fail queued and in-flight futures instead of stranding them"""
+    async def hanging_handler(items):
+        await asyncio.sleep(60)
+        return items
+
+    async def run():
+        batcher = MicroBatcher(hanging_handler, max_batch=2, max_wait=0.01)
+        callers = [asyncio.create_task(batcher.submit(i)) for i in range(6)]
+        await asyncio.sleep(0.05)
+        await batcher.close()
+        return await asyncio.wait_for(
+            asyncio.gather(*callers, return_exceptions=True), timeout=1
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+if __name__ == "__main__":
+    test_batches_run_concurrently()
+    test_handler_failure_propagates()
+    test_per_item_exceptions()
+    test_close_fails_pending_callers()
+    print("✅ MicroBatcher tests passed")
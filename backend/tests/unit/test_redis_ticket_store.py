@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test RedisTicketStore index bookkeeping under concurrent updates
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import fakeredis
+
+from services.redis_ticket_store import RedisTicketStore
+
+TICKETS = [
+    {"id": 1, "status": "open", "priority": "high", "category": "network",
+     "created_at": "2024-01-01T00:00:00Z", "resolved_at": None},
+    {"id": 2, "status": "resolved", "priority": "low", "category": "email",
+     "created_at": "2024-01-01T00:00:00Z", "resolved_at": "2024-01-01T02:00:00Z"},
+]
+
+def _store() -> RedisTicketStore:
+    return RedisTicketStore(fakeredis.FakeAsyncRedis())
+
+def test_update_moves_ticket_between_index_sets():
+    async def run():
+        store = _store()
+        await store.seed(TICKETS)
+        await store.update(1, {"status": "resolved", "resolved_at": "2024-01-01T04:00:00Z"})
+        return (await store.counts("status"), await store.avg_resolution_hours(),
+                await store.filter(status="resolved"))
+
+    counts, hours, resolved = asyncio.run(run())
+    assert counts == {"resolved": 2}
+    assert hours == 3
+    assert [t["id"] for t in resolved] == [1, 2]
+
+def test_concurrent_updates_leave_one_index_entry():
+    """Racing writers must not leave the id in several status/priority sets"""
+    async def run():
+        store = _store()
+        await store.seed(TICKETS)
+        changes = [
+            {"status": status, "priority": priority}
+            for status in ("in_progress", "pending", "closed", "open")
+            for priority in ("low", "medium", "critical")
+        ]
+        await asyncio.gather(*(store.update(1, change) for change in changes))
+        ticket = await store.get(1)
+        status_ids = {status: await store.count("status", status)
+                      for status in ("open", "in_progress", "pending", "closed")}
+        priority_ids = {priority: await store.count("priority", priority)
+                        for priority in ("high", "low", "medium", "critical")}
+        return ticket, status_ids, priority_ids
+
+    ticket, status_ids, priority_ids = asyncio.run(run())
+    assert sum(status_ids.values()) == 1 and status_ids[ticket["status"]] == 1
+    # Ticket 2 stays in "low"
+    assert sum(priority_ids.values()) == 2
+    assert priority_ids[ticket["priority"]] >= 1
+
+def test_concurrent_resolution_counted_once():
+    async def run():
+        store = _store()
+        await store.seed(TICKETS)
+        await asyncio.gather(*(
+            store.update(1, {"status": "resolved", "resolved_at": "2024-01-01T04:00:00Z"})
+            for _ in range(8)
+        ))
+        return await store.avg_resolution_hours()
+
+    assert asyncio.run(run()) == 3
+
+def test_delete_unindexes_and_missing_ids_return_none():
+    async def run():
+        store = _store()
+        await store.seed(TICKETS)
+        deleted = await store.delete(2)
+        return (deleted, await store.delete(2), await store.update(99, {"status": "open"}),
+                await store.size(), await store.avg_resolution_hours(),
+                await store.counts("category"))
+
+    deleted, again, missing, size, hours, categories = asyncio.run(run())
+    assert deleted["id"] == 2
+    assert again is None and missing is None
+    assert size == 1 and hours == 0
+    assert categories == {"network": 1}
+
+if __name__ == "__main__":
+    test_update_moves_ticket_between_index_sets()
+    test_concurrent_updates_leave_one_index_entry()
+    test_concurrent_resolution_counted_once()
+    test_delete_unindexes_and_missing_ids_return_none()
+    print("✅ RedisTicketStore tests passed")
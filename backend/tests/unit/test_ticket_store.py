@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test TicketStore index and resolution-time bookkeeping
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.ticket_store import AsyncTicketStore, TicketStore, _epoch
+
+def _ticket(ticket_id, status="open", priority="medium", category="software",
+            created_at="2024-01-01T00:00:00Z", resolved_at=None):
+    return {"id": ticket_id, "status": status, "priority": priority, "category": category,
+            "created_at": created_at, "resolved_at": resolved_at}
+
+def _store() -> TicketStore:
+    return TicketStore([
+        _ticket(1, priority="high", category="network"),
+        _ticket(2, status="resolved", resolved_at="2024-01-01T02:00:00Z"),
+        _ticket(3, status="resolved", priority="high", resolved_at="2024-01-01T04:00:00+00:00"),
+    ])
+
+def test_epoch_accepts_trailing_z():
+    assert _epoch("2024-01-01T00:00:00Z") == _epoch("2024-01-01T00:00:00+00:00")
+
+def test_filter_intersects_indexes_in_creation_order():
+    store = _store()
+    assert [t["id"] for t in store.filter(priority="high")] == [1, 3]
+    assert [t["id"] for t in store.filter(status="resolved", priority="high")] == [3]
+    assert [t["id"] for t in store.filter(status=None)] == [1, 2, 3]
+    assert store.filter(status="closed") == []
+
+def test_update_moves_ticket_between_index_sets():
+    store = _store()
+    store.update(1, {"status": "resolved", "resolved_at": "2024-01-01T06:00:00Z"})
+    assert store.counts("status") == {"resolved": 3}
+    assert store.count("status", "open") == 0
+    assert store.avg_resolution_hours() == 4
+
+def test_resolution_running_sum_tracks_updates_and_deletes():
+    store = _store()
+    assert store.avg_resolution_hours() == 3
+    store.update(3, {"status": "in_progress", "resolved_at": None})
+    assert store.avg_resolution_hours() == 2
+    store.delete(2)
+    assert store.avg_resolution_hours() == 0
+    assert store.delete(2) is None and store.update(2, {"status": "open"}) is None
+
+def test_next_id_follows_highest_id():
+    store = _store()
+    assert store.next_id() == 4
+    store.add(_ticket(10))
+    assert store.next_id() == 11
+
+def test_async_store_version_bumps_only_on_changes():
+    async def run():
+        store = AsyncTicketStore()
+        await store.seed([_ticket(1)])
+        await store.seed([_ticket(2)])
+        seeded = await store.version(), await store.size()
+        await store.update(99, {"status": "closed"})
+        await store.update(1, {"status": "closed"})
+        return seeded, await store.version()
+
+    (version, size), updated = asyncio.run(run())
+    assert (version, size) == (1, 1)
+    assert updated == 2
+
+if __name__ == "__main__":
+    test_epoch_accepts_trailing_z()
+    test_filter_intersects_indexes_in_creation_order()
+    test_update_moves_ticket_between_index_sets()
+    test_resolution_running_sum_tracks_updates_and_deletes()
+    test_next_id_follows_highest_id()
+    test_async_store_version_bumps_only_on_changes()
+    print("✅ TicketStore tests passed")